@@ -4,11 +4,13 @@ import Dashboard from './components/Dashboard';
 import LoginScreen from './components/LoginScreen';
 import type { User, UserRole } from './types';
 import { MOCK_DOCTORS, MOCK_PATIENTS, MOCK_SUPER_ADMIN, MOCK_HOSPITAL_ADMIN } from './constants';
+import { findDoctor, findPatient, isShardedDatasetEnabled } from './database/shardLoader';
 
 function App() {
   const [user, setUser] = useState<User | null>(null);
 
-  const handleLogin = (role: UserRole, userId: string): boolean => {
+  // Doctors and patients come from the dataset shards when a sharded dataset is served
+  const handleLogin = async (role: UserRole, userId: string): Promise<boolean> => {
     let foundUser: User | null = null;
     
     // Find the user in our new mock database
@@ -25,13 +27,13 @@ function App() {
             }
             break;
         case 'doctor':
-            const doctor = MOCK_DOCTORS.find(d => d.id === userId);
+            const doctor = isShardedDatasetEnabled() ? await findDoctor(userId) : MOCK_DOCTORS.find(d => d.id === userId);
             if (doctor) {
                 foundUser = { role: 'doctor', id: doctor.id, name: doctor.name, data: doctor };
             }
             break;
         case 'patient':
-            const patient = MOCK_PATIENTS.find(p => p.id === userId);
+            const patient = isShardedDatasetEnabled() ? await findPatient(userId) : MOCK_PATIENTS.find(p => p.id === userId);
             if (patient) {
                 foundUser = { role: 'patient', id: patient.id, name: patient.name, data: patient };
             }
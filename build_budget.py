@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+MediMinder AI - Build size budgets and asset pre-compression
+
+Compresses every asset of a production build (dist/) with gzip and, if the
+optional `brotli` package is installed, brotli, writing .gz/.br siblings a
+static server can send as-is. The same pass yields raw/gzip/brotli sizes per
+chunk, which are compared against build-budget.json.
+
+Usage: python build_budget.py [DIST_DIR]   (compress and print sizes)
+"""
+
+import gzip
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # optional: gzip siblings only
+    brotli = None
+
+COMPRESSIBLE = {".js", ".mjs", ".css", ".html", ".svg", ".json", ".txt", ".xml", ".wasm", ".map"}
+# Rollup's default "[name]-[hash].js": the hash changes every build, the name does not
+HASHED_NAME = re.compile(r"^(?P<name>.+)-[A-Za-z0-9_-]{8}(?P<ext>\.[a-z]+)$")
+METRICS = ("raw", "gzip", "brotli")
+
+class AssetSizes(NamedTuple):
+    path: str
+    raw: int
+    gzip: int
+    brotli: Optional[int]
+
+def compress_asset(path: str) -> AssetSizes:
+    """Write path.gz (and path.br) next to path and return the three sizes
+
+    Module-level so it can run in a ProcessPoolExecutor worker. A sibling is
+    only kept if it is smaller than the original.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    sizes = [len(data)]
+    encoders = [(".gz", lambda raw: gzip.compress(raw, 9, mtime=0))]
+    if brotli is not None:
+        encoders.append((".br", lambda raw: brotli.compress(raw, quality=11)))
+    for suffix, encode in encoders:
+        compressed = encode(data)
+        sizes.append(len(compressed))
+        sibling = path + suffix
+        if len(compressed) < len(data):
+            with open(sibling + ".tmp", 'wb') as f:
+                f.write(compressed)
+            os.replace(sibling + ".tmp", sibling)
+        elif os.path.exists(sibling):
+            os.unlink(sibling)
+    return AssetSizes(path, sizes[0], sizes[1], sizes[2] if len(sizes) > 2 else None)
+
+def compress_assets(dist: Path, jobs: Optional[int] = None) -> List[AssetSizes]:
+    """Pre-compress every compressible file under dist in parallel"""
+    paths = sorted(str(path) for path in dist.rglob("*") if path.is_file() and path.suffix in COMPRESSIBLE)
+    if not paths:
+        return []
+    # Brotli at quality 11 is CPU-bound: processes, not threads
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(compress_asset, paths, chunksize=max(1, len(paths) // 64)))
+
+def chunk_name(path: Path) -> str:
+    """Stable budget key of an asset: its name without the content hash"""
+    match = HASHED_NAME.match(path.name)
+    return f"{match['name']}{match['ext']}" if match else path.name
+
+def chunk_sizes(dist: Path, assets: List[AssetSizes]) -> Dict[str, Dict[str, int]]:
+    """Sizes of the chunks in dist/assets keyed by chunk name (source maps excluded)"""
+    chunks: Dict[str, Dict[str, int]] = {}
+    assets_dir = dist / "assets"
+    for asset in assets:
+        path = Path(asset.path)
+        if path.parent != assets_dir or path.suffix == ".map":
+            continue
+        sizes = {"raw": asset.raw, "gzip": asset.gzip}
+        if asset.brotli is not None:
+            sizes["brotli"] = asset.brotli
+        chunks[chunk_name(path)] = sizes
+    return chunks
+
+def load_budget(path: Path) -> Optional[Dict]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def save_budget(path: Path, chunks: Dict[str, Dict[str, int]], tolerance: float = 0.05):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"tolerance": tolerance, "chunks": dict(sorted(chunks.items()))}, f, indent=2)
+        f.write("\n")
+
+def check_budget(chunks: Dict[str, Dict[str, int]], budget: Dict) -> Tuple[List[str], List[str]]:
+    """(regressions, notes): sizes above budget * (1 + tolerance) fail the build"""
+    tolerance = budget.get("tolerance", 0.05)
+    limits = budget.get("chunks", {})
+    regressions = []
+    notes = []
+    for name, sizes in sorted(chunks.items()):
+        if name not in limits:
+            notes.append(f"{name} is new and has no budget")
+            continue
+        for metric in METRICS:
+            if metric in sizes and metric in limits[name]:
+                allowed = limits[name][metric] * (1 + tolerance)
+                if sizes[metric] > allowed:
+                    regressions.append(f"{name} {metric} {format_size(sizes[metric])} > budget "
+                                       f"{format_size(limits[name][metric])} (+{tolerance:.0%})")
+    for name in sorted(set(limits) - set(chunks)):
+        notes.append(f"{name} is in the budget but was not built")
+    return regressions, notes
+
+def format_size(size: Optional[int]) -> str:
+    if size is None:
+        return "-"
+    return f"{size / 1024:.1f} KiB" if size >= 1024 else f"{size} B"
+
+def size_table(chunks: Dict[str, Dict[str, int]]) -> str:
+    width = max([len(name) for name in chunks] + [5])
+    lines = [f"  {'chunk':<{width}} {'raw':>11} {'gzip':>11} {'brotli':>11}"]
+    for name, sizes in sorted(chunks.items(), key=lambda item: -item[1]["raw"]):
+        lines.append(f"  {name:<{width}} " + " ".join(f"{format_size(sizes.get(metric)):>11}" for metric in METRICS))
+    return "\n".join(lines)
+
+def main():
+    """Pre-compress a dist directory and print its chunk sizes"""
+    dist = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("dist")
+    if not dist.is_dir():
+        print(f"{dist} does not exist; run `python setup_dev.py build` first")
+        sys.exit(1)
+    print(size_table(chunk_sizes(dist, compress_assets(dist))))
+    if brotli is None:
+        print("brotli is not installed (pip install brotli); only .gz files were written")
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,10 @@ import { Breadcrumb, TabNavigation } from './ui/Navigation';
 import { ComplianceBadge } from './ui/StatusBadges';
 import { UserIcon, CalendarIcon, PlusIcon } from './Icons';
 import { MedicalDataEmpty } from './ui/ErrorStates';
+import { hospitalStub, isShardedDatasetEnabled } from '../database/shardLoader';
+import { useHospitalShard } from '../hooks/useHospitalShard';
+import { useSearchIndex } from '../hooks/useSearchIndex';
+import { searchPatients } from '../database/mockDatabase';
 
 interface DoctorDashboardProps {
     doctor: Doctor;
@@ -20,19 +24,22 @@ const DoctorDashboard: React.FC<DoctorDashboardProps> = ({ doctor }) => {
   const [complianceFilter, setComplianceFilter] = useState<string[]>([]);
   const [urgentFilter, setUrgentFilter] = useState('');
   
-  const myPatients = MOCK_PATIENTS.filter(p => p.doctorId === doctor.id);
+  // The doctor's hospital shard when a sharded dataset is served (none until it loads), otherwise every in-memory patient
+  const patientSource = useMemo(
+    () => ({ ...hospitalStub(doctor.hospitalId), patients: isShardedDatasetEnabled() ? [] : MOCK_PATIENTS }),
+    [doctor.hospitalId],
+  );
+  const { hospital } = useHospitalShard(patientSource);
+  const myPatients = useMemo(() => hospital.patients.filter(p => p.doctorId === doctor.id), [hospital, doctor.id]);
+
+  // Null until a served index that describes the shard's patients loads; searchPatients scans meanwhile
+  const searchIndex = useSearchIndex();
 
   // Filter patients based on search and filters
   const filteredPatients = useMemo(() => {
-    return myPatients.filter(patient => {
-      const matchesSearch = patient.name.toLowerCase().includes(searchQuery.toLowerCase()) ||
-                           (patient.medicalConditions && patient.medicalConditions.some(condition => 
-                             condition.toLowerCase().includes(searchQuery.toLowerCase())));
-      const matchesCompliance = complianceFilter.length === 0 || complianceFilter.includes(patient.complianceStatus);
-      
-      return matchesSearch && matchesCompliance;
-    });
-  }, [myPatients, searchQuery, complianceFilter]);
+    return searchPatients(searchQuery, myPatients, searchIndex).filter(patient =>
+      complianceFilter.length === 0 || complianceFilter.includes(patient.complianceStatus));
+  }, [myPatients, searchQuery, searchIndex, complianceFilter]);
 
   // Compliance statistics
   const complianceStats = useMemo(() => {
@@ -1,14 +1,33 @@
-import React from 'react';
+import React, { useMemo } from 'react';
 import type { Hospital } from '../types';
-import { DoctorIcon, UserIcon, DownloadIcon } from './Icons';
+import { DoctorIcon, UserIcon, DownloadIcon, TrendingUpIcon } from './Icons';
+import { useHospitalShard } from '../hooks/useHospitalShard';
+import { useHospitalAggregates } from '../hooks/useComplianceAggregates';
+import { aggregatePatients, complianceFor, emptyHospitalAggregates, hospitalCompliance } from '../database/aggregates';
+import { DashboardLoading } from './ui/LoadingStates';
+import { WarningMessage } from './ui/ErrorStates';
 
 interface HospitalAdminDashboardProps {
     hospital: Hospital;
 }
 
-const HospitalAdminDashboard: React.FC<HospitalAdminDashboardProps> = ({ hospital }) => {
+const HospitalAdminDashboard: React.FC<HospitalAdminDashboardProps> = ({ hospital: initialHospital }) => {
+  const { hospital, loading, error } = useHospitalShard(initialHospital);
+  // One pass over the loaded patients, unless this hospital's precomputed aggregates are served
+  const hospitalAggregates = useMemo(
+    () => aggregatePatients(hospital.patients, hospital.doctors, [hospital]).hospitals.get(hospital.id)
+      ?? emptyHospitalAggregates(hospital.id), [hospital]);
+  const { aggregates, loading: aggregatesLoading, error: aggregatesError } = useHospitalAggregates(hospital.id, hospitalAggregates);
+  const compliance = hospitalCompliance(aggregates);
+
+  if (loading || aggregatesLoading) {
+    return <DashboardLoading />;
+  }
+
   return (
     <div className="space-y-6">
+        {error && <WarningMessage message={`Showing built-in data: ${error}`} />}
+        {aggregatesError && <WarningMessage message={`Compliance computed from loaded patients: ${aggregatesError}`} />}
         <div className="flex flex-col sm:flex-row justify-between sm:items-center gap-4">
             <h1 className="text-3xl font-bold">Hospital Admin: {hospital.name}</h1>
             <button className="flex items-center justify-center gap-2 px-4 py-2 bg-green-500 text-white rounded-lg hover:bg-green-600 transition-colors">
@@ -16,7 +35,7 @@ const HospitalAdminDashboard: React.FC<HospitalAdminDashboardProps> = ({ hospita
                 <span>Download Compliance Report</span>
             </button>
         </div>
-        <div className="grid grid-cols-1 md:grid-cols-2 gap-6">
+        <div className="grid grid-cols-1 md:grid-cols-3 gap-6">
             <div className="bg-white dark:bg-gray-800 p-6 rounded-lg shadow flex items-center space-x-4">
                 <DoctorIcon className="w-10 h-10 text-blue-500" />
                 <div>
@@ -31,6 +50,16 @@ const HospitalAdminDashboard: React.FC<HospitalAdminDashboardProps> = ({ hospita
                     <p className="text-2xl font-bold">{hospital.patients.length}</p>
                 </div>
             </div>
+            <div className="bg-white dark:bg-gray-800 p-6 rounded-lg shadow flex items-center space-x-4">
+                <TrendingUpIcon className="w-10 h-10 text-purple-500" />
+                <div>
+                    <p className="text-gray-500 dark:text-gray-400">Compliance Rate</p>
+                    <p className="text-2xl font-bold">{compliance.complianceRate}%</p>
+                    <p className="text-sm text-gray-500 dark:text-gray-400">
+                        {compliance.partial} partial, {compliance.nonCompliant} non-compliant
+                    </p>
+                </div>
+            </div>
         </div>
         <div className="bg-white dark:bg-gray-800 p-6 rounded-lg shadow">
             <h2 className="text-xl font-bold mb-4">Doctors Overview</h2>
@@ -41,16 +70,21 @@ const HospitalAdminDashboard: React.FC<HospitalAdminDashboardProps> = ({ hospita
                         <th className="p-3">Name</th>
                         <th className="p-3">Specialty</th>
                         <th className="p-3">Patient Load</th>
+                        <th className="p-3">Compliance</th>
                     </tr>
                     </thead>
                     <tbody>
-                    {hospital.doctors.map(doctor => (
+                    {hospital.doctors.map(doctor => {
+                        const load = complianceFor(aggregates.doctors, doctor.id);
+                        return (
                         <tr key={doctor.id} className="border-b dark:border-gray-700 last:border-b-0">
                         <td className="p-3 font-semibold">{doctor.name}</td>
                         <td className="p-3">{doctor.specialty}</td>
-                        <td className="p-3">{hospital.patients.filter(p => p.doctorId === doctor.id).length}</td>
+                        <td className="p-3">{load.total}</td>
+                        <td className="p-3">{load.total ? `${load.complianceRate}%` : '-'}</td>
                         </tr>
-                    ))}
+                        );
+                    })}
                     </tbody>
                 </table>
             </div>
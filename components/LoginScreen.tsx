@@ -2,7 +2,7 @@ import React, { useState } from 'react';
 import type { UserRole } from '../types';
 
 interface LoginScreenProps {
-  onLogin: (role: UserRole, userId: string) => boolean;
+  onLogin: (role: UserRole, userId: string) => Promise<boolean>;
 }
 
 const DEMO_CREDENTIALS = {
@@ -24,14 +24,20 @@ const LoginScreen: React.FC<LoginScreenProps> = ({ onLogin }) => {
     setError('');
   };
 
-  const handleSubmit = (e: React.FormEvent) => {
+  const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault();
     if (!userId || !password) {
       setError('Please enter both User ID and Password.');
       return;
     }
     
-    const success = onLogin(role, userId);
+    let success: boolean;
+    try {
+      success = await onLogin(role, userId);
+    } catch (loginError) {
+      setError(`Could not log in: ${(loginError as Error).message}`);
+      return;
+    }
     
     if (!success) {
       setError(`User ID "${userId}" not found for the selected role.`);
@@ -9,6 +9,8 @@ import { MedicationStatusBadge, ComplianceBadge } from './ui/StatusBadges';
 import { Breadcrumb, TabNavigation } from './ui/Navigation';
 import { CheckIcon, ClockIcon, PillIcon, CalendarIcon } from './Icons';
 import { WarningMessage } from './ui/ErrorStates';
+import { hospitalStub, isShardedDatasetEnabled } from '../database/shardLoader';
+import { useHospitalShard } from '../hooks/useHospitalShard';
 
 interface PatientDashboardProps {
     patient: Patient;
@@ -16,7 +18,14 @@ interface PatientDashboardProps {
 
 const PatientDashboard: React.FC<PatientDashboardProps> = ({ patient }) => {
   const [medications, setMedications] = useState(patient.medications);
-  const doctorName = MOCK_DOCTORS.find(d => d.id === patient.doctorId)?.name || 'Your Doctor';
+  // The patient's hospital shard when a sharded dataset is served (none until it loads), otherwise every in-memory doctor
+  const doctorSource = useMemo(
+    () => ({ ...hospitalStub(patient.hospitalId), doctors: isShardedDatasetEnabled() ? [] : MOCK_DOCTORS }),
+    [patient.hospitalId],
+  );
+  const { hospital } = useHospitalShard(doctorSource);
+  const doctor = hospital.doctors.find(d => d.id === patient.doctorId);
+  const doctorName = doctor?.name || 'Your Doctor';
 
   const handleToggleTaken = (medName: string, time: string) => {
     setMedications(prevMeds =>
@@ -47,7 +56,6 @@ const PatientDashboard: React.FC<PatientDashboardProps> = ({ patient }) => {
     medications: medications,
   };
 
-  const doctor = MOCK_DOCTORS.find(d => d.id === patient.doctorId);
   const todaysMedications = medications.filter(med => med.schedule.length > 0);
   const missedDoses = medications.flatMap(med => 
     med.schedule.filter(s => !s.taken).map(s => ({ medication: med.name, time: s.time }))
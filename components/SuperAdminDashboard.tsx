@@ -7,6 +7,10 @@ import { SearchInput, FilterDropdown } from './ui/SearchAndFilter';
 import { Breadcrumb } from './ui/Navigation';
 import { MedicalDataEmpty } from './ui/ErrorStates';
 import type { Hospital } from '../types';
+import { getComplianceAggregates } from '../database/mockDatabase';
+import { overallCompliance } from '../database/aggregates';
+import { useAggregateSummary } from '../hooks/useComplianceAggregates';
+import { useHospitalList } from '../hooks/useHospitalList';
 
 // Re-enabled with error handling
 import { realtimeStateManager } from '../services/realtimeStateManager';
@@ -36,6 +40,10 @@ const SuperAdminDashboard: React.FC = () => {
   const [populationInsights, setPopulationInsights] = useState<any[]>([]);
   const [highRiskPatients, setHighRiskPatients] = useState<any[]>([]);
   const [serviceError, setServiceError] = useState<string | null>(null);
+  const { aggregates } = useAggregateSummary(getComplianceAggregates().summary);
+  // From the dataset's hospital pages when a sharded dataset is served
+  const { hospitals, totalPatients } = useHospitalList(MOCK_HOSPITALS, MOCK_PATIENTS.length);
+  const complianceRate = overallCompliance(aggregates).complianceRate;
   
   // Mock data for demo - TODO: Replace with real services
   const mockAppState = {
@@ -114,26 +122,26 @@ const SuperAdminDashboard: React.FC = () => {
 
   // Get unique locations and types for filters
   const locations = useMemo(() => {
-    const uniqueLocations = [...new Set(MOCK_HOSPITALS.map(h => h.location))];
+    const uniqueLocations = [...new Set(hospitals.map(h => h.location).filter(Boolean))];
     return uniqueLocations.map(location => ({
       label: location,
       value: location,
-      count: MOCK_HOSPITALS.filter(h => h.location === location).length
+      count: hospitals.filter(h => h.location === location).length
     }));
-  }, []);
+  }, [hospitals]);
 
   const types = useMemo(() => {
-    const uniqueTypes = [...new Set(MOCK_HOSPITALS.map(h => h.type).filter(Boolean))];
+    const uniqueTypes = [...new Set(hospitals.map(h => h.type).filter(Boolean))];
     return uniqueTypes.map(type => ({
       label: type!,
       value: type!,
-      count: MOCK_HOSPITALS.filter(h => h.type === type).length
+      count: hospitals.filter(h => h.type === type).length
     }));
-  }, []);
+  }, [hospitals]);
 
   // Filter hospitals based on search and filters
   const filteredHospitals = useMemo(() => {
-    return MOCK_HOSPITALS.filter(hospital => {
+    return hospitals.filter(hospital => {
       const matchesSearch = hospital.name.toLowerCase().includes(searchQuery.toLowerCase()) ||
                            hospital.location.toLowerCase().includes(searchQuery.toLowerCase());
       const matchesLocation = locationFilter.length === 0 || locationFilter.includes(hospital.location);
@@ -141,7 +149,7 @@ const SuperAdminDashboard: React.FC = () => {
       
       return matchesSearch && matchesLocation && matchesType;
     });
-  }, [searchQuery, locationFilter, typeFilter]);
+  }, [hospitals, searchQuery, locationFilter, typeFilter]);
 
   // Table columns definition
   const columns: TableColumn<Hospital>[] = [
@@ -185,7 +193,7 @@ const SuperAdminDashboard: React.FC = () => {
       accessor: (hospital) => (
         <div className="text-center">
           <div className="text-lg font-semibold text-blue-600 dark:text-blue-400">
-            {hospital.doctors.length}
+            {hospital.doctorCount ?? hospital.doctors.length}
           </div>
           <div className="text-xs text-gray-500 dark:text-gray-400">Medical Staff</div>
         </div>
@@ -200,7 +208,7 @@ const SuperAdminDashboard: React.FC = () => {
       accessor: (hospital) => (
         <div className="text-center">
           <div className="text-lg font-semibold text-green-600 dark:text-green-400">
-            {hospital.patients.length}
+            {hospital.patientCount ?? hospital.patients.length}
           </div>
           <div className="text-xs text-gray-500 dark:text-gray-400">Active Patients</div>
         </div>
@@ -293,8 +301,8 @@ const SuperAdminDashboard: React.FC = () => {
   };
 
   // Calculate additional stats
-  const totalBedCapacity = MOCK_HOSPITALS.reduce((sum, hospital) => sum + (hospital.bedCapacity || 0), 0);
-  const avgPatientsPerHospital = Math.round(MOCK_PATIENTS.length / MOCK_HOSPITALS.length);
+  const totalBedCapacity = hospitals.reduce((sum, hospital) => sum + (hospital.bedCapacity || 0), 0);
+  const avgPatientsPerHospital = hospitals.length ? Math.round(totalPatients / hospitals.length) : 0;
   
   // Real-time metrics (mock)
   const criticalAlerts = mockAppState.riskAlerts.filter(alert => alert.riskLevel === 'Critical').length;
@@ -390,7 +398,7 @@ const SuperAdminDashboard: React.FC = () => {
       <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-6">
         <StatCard
           title="Total Hospitals"
-          value={MOCK_HOSPITALS.length}
+          value={hospitals.length}
           icon={<HospitalIcon className="w-8 h-8" />}
           color="red"
           trend={{ value: 12, isPositive: true }}
@@ -411,10 +419,10 @@ const SuperAdminDashboard: React.FC = () => {
         />
         <StatCard
           title="Compliance Rate"
-          value={`${mockAppState.systemMetrics.complianceRate}%`}
+          value={`${complianceRate}%`}
           icon={<TrendingUpIcon className="w-8 h-8" />}
           color="green"
-          trend={{ value: mockAppState.systemMetrics.complianceRate > 80 ? 12 : -8, isPositive: mockAppState.systemMetrics.complianceRate > 80 }}
+          trend={{ value: complianceRate > 80 ? 12 : -8, isPositive: complianceRate > 80 }}
         />
       </div>
 
@@ -588,7 +596,7 @@ const SuperAdminDashboard: React.FC = () => {
         </div>
         <div className="bg-orange-50 dark:bg-orange-900/20 p-6 rounded-lg">
           <div className="text-2xl font-bold text-orange-600 dark:text-orange-400">
-            {Math.round(totalBedCapacity / MOCK_HOSPITALS.length)}
+            {hospitals.length ? Math.round(totalBedCapacity / hospitals.length) : 0}
           </div>
           <div className="text-sm text-orange-800 dark:text-orange-300 font-medium">
             Avg Bed Capacity
@@ -626,7 +634,7 @@ const SuperAdminDashboard: React.FC = () => {
         </div>
         {(searchQuery || locationFilter.length > 0 || typeFilter.length > 0) && (
           <div className="mt-4 text-sm text-gray-600 dark:text-gray-400">
-            Showing {filteredHospitals.length} of {MOCK_HOSPITALS.length} hospitals
+            Showing {filteredHospitals.length} of {hospitals.length} hospitals
           </div>
         )}
       </div>
@@ -658,8 +666,8 @@ const SuperAdminDashboard: React.FC = () => {
         <p className="text-sm text-gray-600 dark:text-gray-400">
           🔄 Last updated: {mockAppState.lastUpdated.toLocaleTimeString()} • 
           📊 3 notifications • 
-          🏥 {MOCK_HOSPITALS.length} hospitals monitored • 
-          👥 {MOCK_PATIENTS.length.toLocaleString()} patients tracked
+          🏥 {hospitals.length} hospitals monitored • 
+          👥 {totalPatients.toLocaleString()} patients tracked
         </p>
         <div className="mt-2 flex justify-center items-center space-x-4 text-xs">
           <span className="flex items-center">
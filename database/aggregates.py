@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+MediMinder AI - Precomputed compliance aggregates
+
+Rolls the patients of the seeded dataset (database/seed.py) up into
+compliance counts by hospital, doctor, specialty and location, so the
+dashboards read a few rows instead of filtering every patient on every
+render (database/aggregates.ts). Each row holds the Compliant / Partial /
+Non-Compliant counts and the sum of compliance percentages; rates and
+averages are derived on read.
+
+Published files, each small and fetched only by the view that shows it:
+
+    aggregates/summary.json                        totals, specialties, locations
+    aggregates/hospitals/<i // 1000>/hospital<i + 1>.json   one hospital and its doctors
+
+aggregates-state/ keeps the rollups and the few fields they depend on as
+.npy arrays (per patient: doctor, status, compliance; per doctor: hospital,
+specialty; per hospital: location; the doctors of each hospital). A delta
+of changed patient records subtracts each patient's stored row and adds the
+new one in place, then rewrites the summary and the hospitals it touched,
+so an update costs O(changed patients) whatever the dataset size.
+
+Delta files are NDJSON with one (possibly partial) patient per line; "id" is
+required, "doctorId", "complianceStatus" and "compliance" are optional and
+keep their stored value when absent. The last line for a patient wins:
+
+    {"id": "patient42", "complianceStatus": "Partial", "compliance": "78%"}
+
+Requires numpy (pip install numpy).
+
+Usage: python -m database.aggregates [PATIENTS] [SEED] [OUT_DIR]
+       python -m database.aggregates --apply DELTA [OUT_DIR]
+"""
+
+import json
+import re
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from database import seed
+
+VERSION = 2
+DIMENSIONS = ("hospital", "doctor", "specialty", "location")
+STATUSES = len(seed.COMPLIANCE_STATUSES)
+# Rollup row layout: one count per status, then the sum of compliance percentages
+COMPLIANCE_SUM = STATUSES
+AGGREGATES_DIR = "aggregates"
+SUMMARY_FILE = "summary.json"
+HOSPITALS_PER_DIRECTORY = 1000
+STATE_DIR = "aggregates-state"
+STATE_DTYPES = {
+    "patients": np.dtype([("doctor", "<u4"), ("status", "u1"), ("compliance", "u1")]),
+    "doctors": np.dtype([("hospital", "<u4"), ("specialty", "u1")]),
+    "hospitals": np.dtype([("location", "u1")]),
+}
+ID_PATTERN = re.compile(r"^(patient|doctor)([1-9][0-9]*)$")
+
+def dimension_sizes(hospitals: int, doctors: int) -> Dict[str, int]:
+    return {"hospital": hospitals, "doctor": doctors,
+            "specialty": len(seed.MEDICAL_SPECIALTIES), "location": len(seed.INDIAN_CITIES)}
+
+def dimension_keys(state: Dict[str, np.ndarray], doctor: np.ndarray) -> Dict[str, np.ndarray]:
+    """Row of each dimension for patients of the given doctors"""
+    hospital = state["doctors"]["hospital"][doctor]
+    return {
+        "hospital": hospital,
+        "doctor": doctor,
+        "specialty": state["doctors"]["specialty"][doctor],
+        "location": state["hospitals"]["location"][hospital],
+    }
+
+def count_batch(rollups: Dict[str, np.ndarray], keys: Dict[str, np.ndarray], status: np.ndarray,
+                compliance: np.ndarray):
+    """Count a batch of patients into every rollup (dense: one bincount per dimension)"""
+    for dimension, key in keys.items():
+        size = len(rollups[dimension])
+        rollups[dimension][:, :STATUSES] += np.bincount(
+            key.astype(np.int64) * STATUSES + status, minlength=size * STATUSES).reshape(size, STATUSES)
+        rollups[dimension][:, COMPLIANCE_SUM] += np.bincount(key, weights=compliance, minlength=size).astype(np.int64)
+
+def adjust(rollups: Dict[str, np.ndarray], keys: Dict[str, np.ndarray], status: np.ndarray,
+           compliance: np.ndarray, sign: int):
+    """Count (sign 1) or uncount (sign -1) a few patients, touching only their rows"""
+    for dimension, key in keys.items():
+        np.add.at(rollups[dimension], (key, status), sign)
+        np.add.at(rollups[dimension], (key, COMPLIANCE_SUM), sign * compliance.astype(np.int64))
+
+def state_path(out_dir: Path, name: str) -> Path:
+    return out_dir / STATE_DIR / f"{name}.npy"
+
+def open_state(out_dir: Path, mode: str = "r+") -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    """(state tables plus the doctors-by-hospital index, rollups) as memory maps"""
+    state = {name: np.lib.format.open_memmap(state_path(out_dir, name), mode=mode)
+             for name in (*STATE_DTYPES, "hospital_doctors", "hospital_offsets")}
+    rollups = {dimension: np.lib.format.open_memmap(state_path(out_dir, f"rollup-{dimension}"), mode=mode)
+               for dimension in DIMENSIONS}
+    return state, rollups
+
+def rollup_state(state: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Rollups recomputed from the stored state in one pass (the reference for incremental updates)"""
+    sizes = dimension_sizes(len(state["hospitals"]), len(state["doctors"]))
+    rollups = {dimension: np.zeros((size, STATUSES + 1), dtype=np.int64) for dimension, size in sizes.items()}
+    patients = state["patients"]
+    for start, end in seed.batch_ranges(len(patients)):
+        rows = patients[start:end]
+        count_batch(rollups, dimension_keys(state, rows["doctor"]), rows["status"], rows["compliance"])
+    return rollups
+
+def rows_json(rows: np.ndarray) -> Dict[str, Any]:
+    """Flattened counts (row r at [r * STATUSES, (r + 1) * STATUSES)) and compliance sums"""
+    return {"counts": rows[:, :STATUSES].ravel().tolist(), "complianceSum": rows[:, COMPLIANCE_SUM].tolist()}
+
+def hospital_path(hospital: int) -> str:
+    """Path of a hospital's aggregates (0-based index) relative to the aggregates directory"""
+    return f"hospitals/{hospital // HOSPITALS_PER_DIRECTORY}/hospital{hospital + 1}.json"
+
+def save_json(document: Dict[str, Any], path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging = path.with_suffix(".tmp")
+    with open(staging, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(document, separators=(",", ":")))
+    staging.replace(path)
+
+def write_summary(out_dir: Path, meta: Dict[str, Any], rollups: Dict[str, np.ndarray]) -> Dict[str, Any]:
+    totals = rollups["location"].sum(axis=0)
+    summary = {
+        **meta,
+        "statuses": seed.COMPLIANCE_STATUSES,
+        "totals": {"counts": totals[:STATUSES].tolist(), "complianceSum": int(totals[COMPLIANCE_SUM])},
+        "specialty": {"keys": seed.MEDICAL_SPECIALTIES, **rows_json(rollups["specialty"])},
+        "location": {"keys": seed.INDIAN_CITIES, **rows_json(rollups["location"])},
+        "hospitals": {
+            "count": len(rollups["hospital"]),
+            "path": "hospitals/{directory}/{hospitalId}.json",
+            "perDirectory": HOSPITALS_PER_DIRECTORY,
+        },
+    }
+    save_json(summary, out_dir / AGGREGATES_DIR / SUMMARY_FILE)
+    return summary
+
+def write_hospital(out_dir: Path, state: Dict[str, np.ndarray], rollups: Dict[str, np.ndarray], hospital: int):
+    """One hospital's row plus the rows of its doctors"""
+    doctors = state["hospital_doctors"][state["hospital_offsets"][hospital]:state["hospital_offsets"][hospital + 1]]
+    row = rollups["hospital"][hospital]
+    save_json({
+        "id": f"hospital{hospital + 1}",
+        "counts": row[:STATUSES].tolist(),
+        "complianceSum": int(row[COMPLIANCE_SUM]),
+        "doctors": {"ids": [f"doctor{doctor + 1}" for doctor in doctors.tolist()],
+                    **rows_json(rollups["doctor"][doctors])},
+    }, out_dir / AGGREGATES_DIR / hospital_path(hospital))
+
+class AggregateSink:
+    """Rollups and state built from generated batches (a seed sink); finish() publishes them under out_dir"""
+    columns = {
+        "hospitals": ("city",),
+        "doctors": ("hospital", "specialty"),
+        "patients": ("doctor", "status", "compliance"),
+    }
+
+    def __init__(self, config: seed.SeedConfig, out_dir: Path):
+        self.config = config
+        self.out_dir = out_dir
+        (out_dir / STATE_DIR).mkdir(parents=True, exist_ok=True)
+        self.state = {table: np.lib.format.open_memmap(state_path(out_dir, table), mode="w+",
+                                                       dtype=dtype, shape=(getattr(config, table),))
+                      for table, dtype in STATE_DTYPES.items()}
+        self.rollups = {dimension: np.lib.format.open_memmap(state_path(out_dir, f"rollup-{dimension}"), mode="w+",
+                                                             dtype=np.int64, shape=(size, STATUSES + 1))
+                        for dimension, size in dimension_sizes(config.hospitals, config.doctors).items()}
+
+    def add(self, table: str, batch: int, columns: Dict[str, np.ndarray]):
+        start, end = seed.batch_ranges(getattr(self.config, table))[batch]
+        rows = self.state[table][start:end]
+        if table == "hospitals":
+            rows["location"] = columns["city"]
+        elif table == "doctors":
+            rows["hospital"] = columns["hospital"]
+            rows["specialty"] = columns["specialty"]
+        else:
+            rows["doctor"] = columns["doctor"]
+            rows["status"] = columns["status"]
+            rows["compliance"] = columns["compliance"]
+            count_batch(self.rollups, dimension_keys(self.state, rows["doctor"]), rows["status"], rows["compliance"])
+
+    def finish(self) -> Dict[str, Any]:
+        """Write aggregates/ (summary and one file per hospital); returns the summary"""
+        config, out_dir = self.config, self.out_dir
+        # Doctors never move between hospitals in a delta, so this index is built once
+        hospital_of_doctor = self.state["doctors"]["hospital"]
+        order = np.argsort(hospital_of_doctor, kind="stable").astype(np.uint32)
+        offsets = np.zeros(config.hospitals + 1, dtype=np.int64)
+        np.cumsum(np.bincount(hospital_of_doctor, minlength=config.hospitals), out=offsets[1:])
+        np.save(state_path(out_dir, "hospital_doctors"), order)
+        np.save(state_path(out_dir, "hospital_offsets"), offsets)
+        for array in (*self.state.values(), *self.rollups.values()):
+            array.flush()
+
+        state, rollups = open_state(out_dir, "r")
+        shutil.rmtree(out_dir / AGGREGATES_DIR, ignore_errors=True)
+        for hospital in range(config.hospitals):
+            write_hospital(out_dir, state, rollups, hospital)
+        return write_summary(out_dir, {"version": VERSION, "seed": config.seed,
+                                       "referenceDate": config.reference_date, "deltas": 0}, rollups)
+
+def write_aggregates(config: seed.SeedConfig, out_dir: Path,
+                     progress: Optional[Callable[[str, int, int], None]] = None) -> Dict[str, Any]:
+    """Generate the dataset into aggregates/ and aggregates-state/ only; returns the summary"""
+    return seed.run_sinks(config, [AggregateSink(config, out_dir)], progress)[0]
+
+def ordinal(value: Any, kind: str, count: int, line: int) -> int:
+    match = ID_PATTERN.match(value) if isinstance(value, str) else None
+    if not match or match.group(1) != kind or int(match.group(2)) > count:
+        raise ValueError(f"line {line}: unknown {kind} id {value!r}")
+    return int(match.group(2)) - 1
+
+def read_delta(path: Path, state: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Patient rows changed by a delta file and their new state (last line per patient wins)"""
+    changes: Dict[int, Dict[str, int]] = {}
+    with open(path, encoding='utf-8') as f:
+        for line, text in enumerate(f, 1):
+            if not text.strip():
+                continue
+            record = json.loads(text)
+            row = ordinal(record.get("id"), "patient", len(state["patients"]), line)
+            fields = changes.setdefault(row, {})
+            if "doctorId" in record:
+                fields["doctor"] = ordinal(record["doctorId"], "doctor", len(state["doctors"]), line)
+            if "complianceStatus" in record:
+                if record["complianceStatus"] not in seed.COMPLIANCE_STATUSES:
+                    raise ValueError(f"line {line}: unknown complianceStatus {record['complianceStatus']!r}")
+                fields["status"] = seed.COMPLIANCE_STATUSES.index(record["complianceStatus"])
+            if "compliance" in record:
+                compliance = int(str(record["compliance"]).rstrip("%"))
+                if not 0 <= compliance <= 100:
+                    raise ValueError(f"line {line}: compliance {record['compliance']!r} is not 0-100%")
+                fields["compliance"] = compliance
+    rows = np.fromiter(changes, dtype=np.int64, count=len(changes))
+    updated = np.array(state["patients"][rows])
+    for index, fields in enumerate(changes.values()):
+        for field, value in fields.items():
+            updated[field][index] = value
+    return rows, updated
+
+def apply_delta(out_dir: Path, delta: Path) -> Dict[str, Any]:
+    """Fold a delta of changed patients into the stored rollups and rewrite only what it touched"""
+    start = time.perf_counter()
+    with open(out_dir / AGGREGATES_DIR / SUMMARY_FILE, encoding='utf-8') as f:
+        summary = json.load(f)
+    state, rollups = open_state(out_dir)
+    rows, updated = read_delta(delta, state)
+    previous = np.array(state["patients"][rows])
+    before = dimension_keys(state, previous["doctor"])
+    after = dimension_keys(state, updated["doctor"])
+    adjust(rollups, before, previous["status"], previous["compliance"], -1)
+    adjust(rollups, after, updated["status"], updated["compliance"], 1)
+    state["patients"][rows] = updated
+    for array in (state["patients"], *rollups.values()):
+        array.flush()
+
+    hospitals = np.unique(np.concatenate([before["hospital"], after["hospital"]])).tolist()
+    for hospital in hospitals:
+        write_hospital(out_dir, state, rollups, hospital)
+    meta = {key: summary[key] for key in ("version", "seed", "referenceDate")}
+    summary = write_summary(out_dir, {**meta, "deltas": summary["deltas"] + 1}, rollups)
+    return {"patients": len(rows), "hospitals": len(hospitals),
+            "seconds": round(time.perf_counter() - start, 3), "totals": summary["totals"]}
+
+def main():
+    """Write aggregates, or apply a delta to existing ones"""
+    if len(sys.argv) > 2 and sys.argv[1] == "--apply":
+        out = Path(sys.argv[3]) if len(sys.argv) > 3 else Path("database/generated")
+        result = apply_delta(out, Path(sys.argv[2]))
+        print(f"Applied {result['patients']:,} changed patients ({result['hospitals']:,} hospitals) in "
+              f"{result['seconds'] * 1000:.1f} ms; totals {dict(zip(seed.COMPLIANCE_STATUSES, result['totals']['counts']))}")
+        return
+    patients = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    seed_value = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    out = Path(sys.argv[3]) if len(sys.argv) > 3 else Path("database/generated")
+    start = time.perf_counter()
+    summary = write_aggregates(seed.SeedConfig.for_patients(patients, seed_value), out)
+    print(f"Wrote aggregates for {patients:,} patients ({summary['hospitals']['count']:,} hospital files) "
+          f"to {out / AGGREGATES_DIR} in {time.perf_counter() - start:.2f}s")
+
+if __name__ == "__main__":
+    main()
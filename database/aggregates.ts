@@ -0,0 +1,186 @@
+import type { ComplianceStatus, Doctor, Hospital, Patient } from '../types';
+
+// Compliance rollups, either precomputed by `setup_dev.py seed --aggregates`
+// (database/aggregates.py) or built in one pass over in-memory patients.
+// The precomputed ones are split so each dashboard fetches only what it shows:
+// aggregates/summary.json (totals, specialties, locations) and one file per
+// hospital with that hospital's row and its doctors' rows.
+
+export interface ComplianceSummary {
+  compliant: number;
+  partial: number;
+  nonCompliant: number;
+  total: number;
+  // Percent of patients that are Compliant, rounded
+  complianceRate: number;
+  // Mean of the patients' compliance percentages, rounded
+  averageCompliance: number;
+}
+
+export interface RollupTable {
+  keys: string[];
+  // Row r's counts are at [r * 3, r * 3 + 3), in the order of statuses
+  counts: number[];
+  complianceSum: number[];
+}
+
+export interface AggregateSummary {
+  version: number;
+  seed: number | null;
+  referenceDate: string | null;
+  // Delta files applied since the aggregates were built
+  deltas: number;
+  statuses: ComplianceStatus[];
+  totals: { counts: number[]; complianceSum: number };
+  specialty: RollupTable;
+  location: RollupTable;
+  hospitals: { count: number; path: string; perDirectory: number };
+}
+
+export interface HospitalAggregates {
+  id: string;
+  counts: number[];
+  complianceSum: number;
+  doctors: RollupTable;
+}
+
+export interface ComplianceAggregates {
+  summary: AggregateSummary;
+  hospitals: Map<string, HospitalAggregates>;
+}
+
+interface HospitalFile extends Omit<HospitalAggregates, 'doctors'> {
+  doctors: { ids: string[]; counts: number[]; complianceSum: number[] };
+}
+
+const STATUSES: ComplianceStatus[] = ['Compliant', 'Partial', 'Non-Compliant'];
+
+// Set by setup_dev.py when database/generated/aggregates/summary.json exists
+const AGGREGATES_URL: string = import.meta.env.VITE_AGGREGATES_URL || '';
+
+let summaryRequest: Promise<AggregateSummary> | null = null;
+
+export const isAggregatesEnabled = () => AGGREGATES_URL !== '';
+
+const aggregatesUrl = (path: string) => `${AGGREGATES_URL.replace(/\/?$/, '/')}${path}`;
+
+const fetchJson = async <T>(path: string, what: string): Promise<T> => {
+  const response = await fetch(aggregatesUrl(path));
+  if (!response.ok) {
+    throw new Error(`Failed to load ${what}: HTTP ${response.status}`);
+  }
+  return response.json();
+};
+
+export const loadAggregateSummary = (): Promise<AggregateSummary> => {
+  if (!summaryRequest) {
+    summaryRequest = fetchJson<AggregateSummary>('summary.json', 'compliance aggregates').then(summary => {
+      if (summary.statuses.join() !== STATUSES.join()) {
+        throw new Error(`Unexpected compliance statuses in aggregates: ${summary.statuses.join(', ')}`);
+      }
+      return summary;
+    });
+    summaryRequest.catch(() => { summaryRequest = null; });
+  }
+  return summaryRequest;
+};
+
+// Not cached: a hospital's rows change with every applied delta and the file is small
+export const loadHospitalAggregates = async (hospitalId: string): Promise<HospitalAggregates> => {
+  const summary = await loadAggregateSummary();
+  const index = Number(hospitalId.replace(/^hospital/, '')) - 1;
+  if (!Number.isInteger(index) || index < 0 || index >= summary.hospitals.count) {
+    throw new Error(`No compliance aggregates for ${hospitalId}`);
+  }
+  const path = summary.hospitals.path
+    .replace('{directory}', String(Math.floor(index / summary.hospitals.perDirectory)))
+    .replace('{hospitalId}', hospitalId);
+  const { doctors, ...hospital } = await fetchJson<HospitalFile>(path, `compliance aggregates for ${hospitalId}`);
+  return { ...hospital, doctors: { keys: doctors.ids, counts: doctors.counts, complianceSum: doctors.complianceSum } };
+};
+
+const summarize = (counts: ArrayLike<number>, offset: number, complianceSum: number): ComplianceSummary => {
+  const [compliant, partial, nonCompliant] = [counts[offset], counts[offset + 1], counts[offset + 2]];
+  const total = compliant + partial + nonCompliant;
+  return {
+    compliant,
+    partial,
+    nonCompliant,
+    total,
+    complianceRate: total ? Math.round((compliant / total) * 100) : 0,
+    averageCompliance: total ? Math.round(complianceSum / total) : 0,
+  };
+};
+
+export const overallCompliance = (summary: AggregateSummary): ComplianceSummary =>
+  summarize(summary.totals.counts, 0, summary.totals.complianceSum);
+
+export const hospitalCompliance = (hospital: HospitalAggregates): ComplianceSummary =>
+  summarize(hospital.counts, 0, hospital.complianceSum);
+
+// One row of a table (a doctor, specialty or location); all zero when nobody is counted under key
+export const complianceFor = (table: RollupTable, key: string): ComplianceSummary => {
+  const row = table.keys.indexOf(key);
+  return row < 0 ? summarize([0, 0, 0], 0, 0) : summarize(table.counts, row * 3, table.complianceSum[row]);
+};
+
+const emptyTable = (): RollupTable => ({ keys: [], counts: [], complianceSum: [] });
+
+// A hospital nobody is counted under
+export const emptyHospitalAggregates = (hospitalId: string): HospitalAggregates =>
+  ({ id: hospitalId, counts: [0, 0, 0], complianceSum: 0, doctors: emptyTable() });
+
+// The same rollups in one pass over in-memory records (patients of unknown doctors count only in their hospital and location)
+export const aggregatePatients = (patients: Patient[], doctors: Doctor[], hospitals: Hospital[]): ComplianceAggregates => {
+  const doctorById = new Map(doctors.map(doctor => [doctor.id, doctor]));
+  const locationOf = new Map(hospitals.map(hospital => [hospital.id, hospital.location]));
+  const totals = { counts: [0, 0, 0], complianceSum: 0 };
+  const specialty = emptyTable();
+  const location = emptyTable();
+  const byHospital = new Map<string, HospitalAggregates>();
+  const rowsOf = new Map<RollupTable, Map<string, number>>();
+  const count = (table: RollupTable, key: string, status: number, compliance: number) => {
+    let rows = rowsOf.get(table);
+    if (!rows) {
+      rows = new Map();
+      rowsOf.set(table, rows);
+    }
+    let row = rows.get(key);
+    if (row === undefined) {
+      row = table.keys.length;
+      rows.set(key, row);
+      table.keys.push(key);
+      table.counts.push(0, 0, 0);
+      table.complianceSum.push(0);
+    }
+    table.counts[row * 3 + status]++;
+    table.complianceSum[row] += compliance;
+  };
+  for (const patient of patients) {
+    const status = STATUSES.indexOf(patient.complianceStatus);
+    if (status < 0) continue;
+    const compliance = parseInt(patient.compliance, 10) || 0;
+    totals.counts[status]++;
+    totals.complianceSum += compliance;
+    let hospital = byHospital.get(patient.hospitalId);
+    if (!hospital) {
+      hospital = emptyHospitalAggregates(patient.hospitalId);
+      byHospital.set(patient.hospitalId, hospital);
+    }
+    hospital.counts[status]++;
+    hospital.complianceSum += compliance;
+    const city = locationOf.get(patient.hospitalId);
+    if (city !== undefined) count(location, city, status, compliance);
+    const doctor = doctorById.get(patient.doctorId);
+    if (!doctor) continue;
+    count(hospital.doctors, doctor.id, status, compliance);
+    count(specialty, doctor.specialty, status, compliance);
+  }
+  return {
+    summary: {
+      version: 2, seed: null, referenceDate: null, deltas: 0, statuses: STATUSES, totals, specialty, location,
+      hospitals: { count: byHospital.size, path: '', perDirectory: 0 },
+    },
+    hospitals: byHospital,
+  };
+};
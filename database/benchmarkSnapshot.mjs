@@ -0,0 +1,83 @@
+// Compare opening a columnar dataset snapshot (database/snapshotReader.ts) with
+// generateComprehensiveMockDatabase (database/mockDatabase.ts): load time and
+// memory retained per 1,000 patients. The TypeScript modules are loaded through
+// Vite's SSR module loader, so nothing needs a separate build step.
+//
+// Usage: node --expose-gc database/benchmarkSnapshot.mjs [SNAPSHOT] [ROUNDS]
+
+import { readFile } from 'node:fs/promises';
+import { performance } from 'node:perf_hooks';
+import { createServer } from 'vite';
+
+const snapshotPath = process.argv[2] || 'database/generated/dataset.snapshot';
+const rounds = Number(process.argv[3] || 5);
+
+if (typeof globalThis.gc !== 'function') {
+  console.error('Run with node --expose-gc so heap sizes are measured after a full collection');
+  process.exit(1);
+}
+
+const memory = () => {
+  globalThis.gc();
+  const { heapUsed, arrayBuffers } = process.memoryUsage();
+  return { heap: heapUsed, buffers: arrayBuffers };
+};
+
+const median = values => [...values].sort((a, b) => a - b)[Math.floor(values.length / 2)];
+
+// Median load time, and the memory each loaded value keeps alive. Every
+// round's value stays reachable until the end: a freed ArrayBuffer's backing
+// store is released asynchronously, so per-round deltas would undercount.
+const measure = async (load, patientsOf) => {
+  const times = [];
+  const loaded = [];
+  const baseline = memory();
+  for (let round = 0; round < rounds; round++) {
+    const start = performance.now();
+    loaded.push(await load());
+    times.push(performance.now() - start);
+  }
+  const after = memory();
+  return {
+    ms: median(times),
+    heap: (after.heap - baseline.heap) / rounds,
+    buffers: (after.buffers - baseline.buffers) / rounds,
+    patients: patientsOf(loaded[0]),
+  };
+};
+
+const report = (label, result) => {
+  const perThousand = 1000 / Math.max(result.patients, 1);
+  const mib = bytes => (bytes / (1 << 20)).toFixed(2).padStart(9);
+  console.log(
+    `${label.padEnd(34)} ${result.patients.toLocaleString().padStart(11)} patients ` +
+    `${result.ms.toFixed(2).padStart(10)} ms ${(result.ms * perThousand).toFixed(3).padStart(9)} ms/1k ` +
+    `heap ${mib(result.heap)} MiB  buffers ${mib(result.buffers)} MiB ` +
+    `(${((result.heap + result.buffers) * perThousand / 1024).toFixed(1)} KiB/1k)`);
+};
+
+const vite = await createServer({
+  server: { middlewareMode: true, hmr: false, watch: null },
+  appType: 'custom',
+  logLevel: 'silent',
+});
+try {
+  const { generateComprehensiveMockDatabase } = await vite.ssrLoadModule('/database/mockDatabase.ts');
+  const { readSnapshot, complianceCounts } = await vite.ssrLoadModule('/database/snapshotReader.ts');
+
+  report('generateComprehensiveMockDatabase', await measure(
+    () => generateComprehensiveMockDatabase(), database => database.patients.length));
+
+  const bytes = await readFile(snapshotPath);
+  const buffer = () => bytes.buffer.slice(bytes.byteOffset, bytes.byteOffset + bytes.byteLength);
+  report('readSnapshot (copy + open)', await measure(
+    () => readSnapshot(buffer()), snapshot => snapshot.patients.rows));
+
+  const snapshot = readSnapshot(buffer());
+  const start = performance.now();
+  const counts = complianceCounts(snapshot);
+  console.log(`complianceCounts over ${snapshot.patients.rows.toLocaleString()} patients: ` +
+              `${(performance.now() - start).toFixed(2)} ms ${JSON.stringify(counts)}`);
+} finally {
+  await vite.close();
+}
@@ -1,4 +1,6 @@
 import type { Hospital, Doctor, Patient, Medication, ComplianceStatus } from '../types';
+import { aggregatePatients, overallCompliance, type ComplianceAggregates } from './aggregates';
+import { filterIndexed, type SearchIndex } from './searchIndex';
 
 // Expanded medical data for realistic generation
 const MEDICAL_CONDITIONS = [
@@ -252,9 +254,10 @@ export const generateComprehensiveMockDatabase = () => {
   }
   
   // Generate 2000 patients (4 per doctor on average)
+  const hospitalById = new Map(hospitals.map(hospital => [hospital.id, hospital]));
   for (let i = 1; i <= 2000; i++) {
     const doctor = getRandomElement(doctors);
-    const hospital = hospitals.find(h => h.id === doctor.hospitalId)!;
+    const hospital = hospitalById.get(doctor.hospitalId)!;
     const patient = generateRealisticPatient(i, doctor.id, hospital.id);
     patients.push(patient);
     hospital.patients.push(patient);
@@ -274,7 +277,10 @@ export const generateComprehensiveMockDatabase = () => {
   };
 };
 
-// Database instance
+// Database instance. Generated even when a sharded dataset is served: the
+// hospital admin login, predictiveAnalytics and realtimeStateManager read these
+// collections (and the doctor and patient views when no dataset is served).
+// Its size is fixed whatever the size of the served dataset.
 export const mockDatabase = generateComprehensiveMockDatabase();
 
 // Export collections
@@ -302,31 +308,42 @@ export const getHospitalById = (hospitalId: string) =>
 export const getPatientById = (patientId: string) => 
   PATIENTS.find(patient => patient.id === patientId);
 
-// Advanced query functions
-export const searchPatients = (query: string) => 
-  PATIENTS.filter(patient => 
+// Advanced query functions. Given a search index that describes the records
+// (useSearchIndex: records of the served dataset) only the matching terms'
+// postings are read, unless scanning the records is cheaper; without one every
+// record is scanned. Both ways match the same records.
+export const searchPatients = (query: string, patients: Patient[] = PATIENTS, index: SearchIndex | null = null) => {
+  const matches = index && filterIndexed(index, 'patients', query, patients);
+  if (matches) {
+    return matches;
+  }
+  return patients.filter(patient => 
     patient.name.toLowerCase().includes(query.toLowerCase()) ||
-    patient.medicalConditions.some(condition => 
+    (patient.medicalConditions ?? []).some(condition => 
       condition.toLowerCase().includes(query.toLowerCase())
     )
   );
+};
 
-export const searchDoctors = (query: string) => 
-  DOCTORS.filter(doctor => 
+export const searchDoctors = (query: string, doctors: Doctor[] = DOCTORS, index: SearchIndex | null = null) => {
+  const matches = index && filterIndexed(index, 'doctors', query, doctors);
+  if (matches) {
+    return matches;
+  }
+  return doctors.filter(doctor => 
     doctor.name.toLowerCase().includes(query.toLowerCase()) ||
     doctor.specialty.toLowerCase().includes(query.toLowerCase())
   );
+};
 
-export const getComplianceStatistics = () => {
-  const compliant = PATIENTS.filter(p => p.complianceStatus === 'Compliant').length;
-  const partial = PATIENTS.filter(p => p.complianceStatus === 'Partial').length;
-  const nonCompliant = PATIENTS.filter(p => p.complianceStatus === 'Non-Compliant').length;
-  
-  return {
-    compliant,
-    partial,
-    nonCompliant,
-    total: PATIENTS.length,
-    complianceRate: Math.round((compliant / PATIENTS.length) * 100)
-  };
-};
\ No newline at end of file
+// Compliance rollups by hospital, doctor, specialty and location, built on first use in one pass
+let complianceAggregates: ComplianceAggregates | null = null;
+
+export const getComplianceAggregates = () => {
+  if (!complianceAggregates) {
+    complianceAggregates = aggregatePatients(PATIENTS, DOCTORS, HOSPITALS);
+  }
+  return complianceAggregates;
+};
+
+export const getComplianceStatistics = () => overallCompliance(getComplianceAggregates().summary);
\ No newline at end of file
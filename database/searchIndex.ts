@@ -0,0 +1,181 @@
+// Query side of the search indexes written by `setup_dev.py seed --search-index`
+// (database/search_index.py). Replaces the lowercase-everything scans of
+// searchPatients / searchDoctors: a query touches only the posting lists of
+// the terms it matches, whatever the number of records.
+//
+// Results are those of the scans: records where the lowercased query is a
+// substring of the name or of one condition / specialty. Queries of 3+
+// characters find their terms through trigrams; shorter ones check every
+// term (a few hundred, not a record each).
+
+export type SearchTable = 'patients' | 'doctors';
+
+interface TableIndex {
+  rows: number;
+  terms: string[];
+  counts: number[];
+  postings: number;
+  offsets: number[];
+  trigrams: Record<string, number[]>;
+}
+
+export interface SearchIndex {
+  version: number;
+  seed: number;
+  tables: Record<SearchTable, TableIndex>;
+  // Lowercased terms, per table
+  lowered: Record<SearchTable, string[]>;
+  postings: Uint8Array;
+}
+
+const MAGIC = 'MMSIDX01';
+const PREAMBLE_BYTES = 16;
+
+// Set by setup_dev.py when database/generated/search-index.bin exists
+const SEARCH_INDEX_URL: string = import.meta.env.VITE_SEARCH_INDEX_URL || '';
+
+let servedRequest: Promise<SearchIndex> | null = null;
+
+export const isSearchIndexEnabled = () => SEARCH_INDEX_URL !== '';
+
+export const readSearchIndex = (buffer: ArrayBuffer): SearchIndex => {
+  if (new TextDecoder().decode(new Uint8Array(buffer, 0, 8)) !== MAGIC) {
+    throw new Error('Not a MediMinder search index');
+  }
+  const headerBytes = new DataView(buffer).getUint32(8, true);
+  const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, PREAMBLE_BYTES, headerBytes)));
+  const tables = header.tables as Record<SearchTable, TableIndex>;
+  return {
+    version: header.version,
+    seed: header.seed,
+    tables,
+    lowered: {
+      patients: tables.patients.terms.map(term => term.toLowerCase()),
+      doctors: tables.doctors.terms.map(term => term.toLowerCase()),
+    },
+    postings: new Uint8Array(buffer, PREAMBLE_BYTES + headerBytes),
+  };
+};
+
+export const loadSearchIndex = async (url: string): Promise<SearchIndex> => {
+  const response = await fetch(url);
+  if (!response.ok) {
+    throw new Error(`Failed to load search index: HTTP ${response.status}`);
+  }
+  return readSearchIndex(await response.arrayBuffer());
+};
+
+// The index setup_dev.py serves, fetched once
+export const loadServedSearchIndex = (): Promise<SearchIndex> => {
+  if (!servedRequest) {
+    servedRequest = loadSearchIndex(SEARCH_INDEX_URL);
+    servedRequest.catch(() => { servedRequest = null; });
+  }
+  return servedRequest;
+};
+
+// Append the ordinals of one term (varint gaps) to out at position, returning the new position
+const decodePostings = (index: SearchIndex, table: TableIndex, term: number, out: Uint32Array, position: number) => {
+  const bytes = index.postings;
+  let at = table.postings + table.offsets[term];
+  const end = table.postings + table.offsets[term + 1];
+  let ordinal = 0;
+  while (at < end) {
+    let gap = 0;
+    let shift = 0;
+    let byte: number;
+    do {
+      byte = bytes[at++];
+      gap += (byte & 0x7f) * 2 ** shift;
+      shift += 7;
+    } while (byte & 0x80);
+    ordinal += gap;
+    out[position++] = ordinal;
+  }
+  return position;
+};
+
+const intersectTermLists = (lists: number[][]): number[] => {
+  const [first, ...rest] = [...lists].sort((a, b) => a.length - b.length);
+  return rest.reduce((kept, list) => {
+    const present = new Set(list);
+    return kept.filter(term => present.has(term));
+  }, first);
+};
+
+// Term ids containing needle (lowercase)
+const queryTerms = (index: SearchIndex, table: SearchTable, needle: string): number[] => {
+  const lowered = index.lowered[table];
+  if (needle.length < 3) {
+    const terms: number[] = [];
+    lowered.forEach((text, term) => {
+      if (text.includes(needle)) terms.push(term);
+    });
+    return terms;
+  }
+  const lists: number[][] = [];
+  for (let i = 0; i + 3 <= needle.length; i++) {
+    const terms = index.tables[table].trigrams[needle.slice(i, i + 3)];
+    if (!terms) return [];
+    lists.push(terms);
+  }
+  // Trigrams can all occur without the needle itself: confirm on the (short) term
+  return intersectTermLists(lists).filter(term => lowered[term].includes(needle));
+};
+
+const postingCount = (info: TableIndex, terms: number[]) =>
+  terms.reduce((total, term) => total + info.counts[term], 0);
+
+// Ordinals of the records holding any of terms, sorted and distinct
+const decodeTerms = (index: SearchIndex, table: SearchTable, terms: number[]): Uint32Array => {
+  const info = index.tables[table];
+  let matches = new Uint32Array(postingCount(info, terms));
+  let position = 0;
+  for (const term of terms) {
+    position = decodePostings(index, info, term, matches, position);
+  }
+  if (terms.length > 1) {
+    // A record can hold several matching terms (e.g. its name and a condition)
+    matches.sort();
+    let unique = 0;
+    for (let i = 0; i < matches.length; i++) {
+      if (i === 0 || matches[i] !== matches[i - 1]) matches[unique++] = matches[i];
+    }
+    matches = matches.subarray(0, unique);
+  }
+  return matches;
+};
+
+// Sorted ordinals of the records the scan would match; null for an empty query (no filtering)
+export const searchOrdinals = (index: SearchIndex, table: SearchTable, query: string): Uint32Array | null =>
+  query ? decodeTerms(index, table, queryTerms(index, table, query.toLowerCase())) : null;
+
+const includesOrdinal = (ordinals: Uint32Array, ordinal: number) => {
+  let low = 0;
+  let high = ordinals.length;
+  while (low < high) {
+    const middle = (low + high) >>> 1;
+    if (ordinals[middle] < ordinal) low = middle + 1;
+    else high = middle;
+  }
+  return low < ordinals.length && ordinals[low] === ordinal;
+};
+
+// The records (Patient / Doctor objects of the indexed dataset, "patient42") matching query,
+// or null when scanning them is cheaper: decoding costs a step per matching posting
+// in the whole dataset, a scan a step per record (e.g. "a" against one doctor's patients).
+// Each record's ordinal is looked up in the matches, so no set of every match is built.
+export const filterIndexed = <T extends { id: string }>(
+  index: SearchIndex, table: SearchTable, query: string, records: T[],
+): T[] | null => {
+  if (!query) {
+    return records;
+  }
+  const terms = queryTerms(index, table, query.toLowerCase());
+  if (postingCount(index.tables[table], terms) > records.length) {
+    return null;
+  }
+  const ordinals = decodeTerms(index, table, terms);
+  const prefix = table === 'patients' ? 'patient' : 'doctor';
+  return records.filter(record => includesOrdinal(ordinals, Number(record.id.slice(prefix.length)) - 1));
+};
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+MediMinder AI - Precomputed search indexes for patients and doctors
+
+Replaces the per-keystroke scans of searchPatients (name, medical
+conditions) and searchDoctors (name, specialty) with an inverted index built
+once alongside the seeded dataset (database/seed.py), queried by
+database/searchIndex.ts.
+
+The searchable fields draw from small vocabularies, so the index has two
+levels:
+
+- terms: every distinct field value ("Aarav Sharma", "Hypertension"), each
+  with a posting list of the record ordinals containing it, stored as
+  LEB128 varints of the gaps between ordinals
+- trigrams: every lowercase trigram of the terms (spaces included), each
+  mapping to the sorted ids of the terms that contain it
+
+A query matches exactly what the scans match: records where the whole
+lowercased query is a substring of one term. A query of 3+ characters
+intersects the term lists of its trigrams and keeps the terms that really
+contain it; a shorter one is checked against every term, which is cheap
+because the vocabularies hold under a thousand terms. The record set is the
+union of the matching terms' postings.
+
+Requires numpy (pip install numpy).
+
+Usage: python -m database.search_index [PATIENTS] [SEED] [OUT_FILE]
+       python -m database.search_index --benchmark [PATIENTS ...]
+"""
+
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from database import seed
+from database.snapshot import PREAMBLE, aligned
+
+MAGIC = b"MMSIDX01"
+VERSION = 2
+BENCHMARK_QUERIES = ["sharma", "aarav sharma", "diab", "hypertension", "ar", "kavya iyer", "arthritis", "zzz"]
+
+def table_terms(table: str) -> Tuple[List[str], Callable[[Dict[str, np.ndarray]], np.ndarray]]:
+    """(vocabulary, columns -> rows x slots term ids, -1 for empty) of a searchable table"""
+    first_names = [name for gender in seed.GENDERS for name in seed.FIRST_NAMES[gender]]
+    names = [f"{first} {last}" for first in first_names for last in seed.LAST_NAMES]
+
+    def name_terms(columns: Dict[str, np.ndarray]) -> np.ndarray:
+        return seed.first_name_codes(columns) * len(seed.LAST_NAMES) + columns["last_name"]
+
+    if table == "patients":
+        def patient_terms(columns: Dict[str, np.ndarray]) -> np.ndarray:
+            conditions = columns["conditions"].astype(np.int32)
+            return np.column_stack([name_terms(columns), np.where(conditions < 0, -1, len(names) + conditions)])
+        return names + seed.MEDICAL_CONDITIONS, patient_terms
+
+    def doctor_terms(columns: Dict[str, np.ndarray]) -> np.ndarray:
+        return np.column_stack([name_terms(columns), len(names) + columns["specialty"].astype(np.int32)])
+    return [f"Dr. {name}" for name in names] + seed.MEDICAL_SPECIALTIES, doctor_terms
+
+def encode_varints(values: np.ndarray) -> bytes:
+    """LEB128: 7 bits per byte, high bit set on all but the last byte of a value"""
+    values = values.astype(np.uint64)
+    lengths = np.ones(len(values), dtype=np.int64)
+    for k in range(1, 5):
+        lengths += values >= (1 << (7 * k))
+    starts = np.cumsum(lengths) - lengths
+    out = np.empty(int(lengths.sum()), dtype=np.uint8)
+    for k in range(5):
+        mask = lengths > k
+        chunk = (values[mask] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        out[starts[mask] + k] = chunk.astype(np.uint8) | ((lengths[mask] > k + 1).astype(np.uint8) << 7)
+    return out.tobytes()
+
+def decode_varints(data: np.ndarray) -> np.ndarray:
+    ends = np.flatnonzero(data < 0x80)
+    if not len(ends):
+        return np.empty(0, dtype=np.uint32)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    group = np.repeat(np.arange(len(ends)), ends - starts + 1)
+    position = np.arange(len(data)) - starts[group]
+    # Exact in float64: values stay below 2^35
+    return np.bincount(group, weights=(data & 0x7F) * np.exp2(7 * position)).astype(np.uint32)
+
+def term_trigrams(text: str) -> List[str]:
+    lowered = text.lower()
+    return sorted({lowered[i:i + 3] for i in range(len(lowered) - 2)})
+
+class IndexSink:
+    """Search index built from generated batches (a seed sink); finish() writes it to path
+
+    Postings are collected batch by batch: ordinals grow across batches, so
+    each term's list stays sorted by appending.
+    """
+    columns = {
+        "doctors": ("gender", "first_name", "last_name", "specialty"),
+        "patients": ("gender", "first_name", "last_name", "conditions"),
+    }
+
+    def __init__(self, config: seed.SeedConfig, path: Path):
+        self.config = config
+        self.path = path
+        self.vocabularies = {table: table_terms(table) for table in self.columns}
+        self.collected: Dict[str, List[List[np.ndarray]]] = {table: [[] for _ in self.vocabularies[table][0]]
+                                                             for table in self.vocabularies}
+
+    def add(self, table: str, batch: int, columns: Dict[str, np.ndarray]):
+        start, end = seed.batch_ranges(getattr(self.config, table))[batch]
+        terms = self.vocabularies[table][1](columns)
+        ordinals = np.broadcast_to(np.arange(start, end, dtype=np.uint32)[:, None], terms.shape).ravel()
+        terms = terms.ravel()
+        keep = terms >= 0
+        terms, ordinals = terms[keep], ordinals[keep]
+        # Stable, so ordinals stay ascending within a term (one record lists a term once)
+        order = np.argsort(terms, kind="stable")
+        terms, ordinals = terms[order], ordinals[order]
+        bounds = np.flatnonzero(np.diff(terms)) + 1
+        for term, group in zip(terms[np.concatenate(([0], bounds))].tolist(), np.split(ordinals, bounds)):
+            self.collected[table][term].append(group)
+
+    def build(self) -> Tuple[Dict[str, Any], bytes]:
+        """(JSON header, postings blob) for patients and doctors"""
+        header: Dict[str, Any] = {"version": VERSION, "seed": self.config.seed, "tables": {}}
+        blob = bytearray()
+        for table, (vocabulary, _) in self.vocabularies.items():
+            terms, offsets, counts = [], [], []
+            trigrams: Dict[str, List[int]] = {}
+            start = len(blob)
+            for text, groups in zip(vocabulary, self.collected[table]):
+                if not groups:
+                    continue
+                ordinals = np.concatenate(groups)
+                term = len(terms)
+                terms.append(text)
+                offsets.append(len(blob) - start)
+                counts.append(len(ordinals))
+                blob += encode_varints(np.diff(ordinals, prepend=np.uint32(0)))
+                for gram in term_trigrams(text):
+                    trigrams.setdefault(gram, []).append(term)
+            offsets.append(len(blob) - start)
+            header["tables"][table] = {
+                "rows": getattr(self.config, table),
+                "terms": terms,
+                "counts": counts,
+                # Byte range of term t's postings: [postings + offsets[t], postings + offsets[t + 1])
+                "postings": start,
+                "offsets": offsets,
+                "trigrams": dict(sorted(trigrams.items())),
+            }
+            blob += b"\0" * (aligned(len(blob)) - len(blob))
+        return header, bytes(blob)
+
+    def finish(self) -> Dict[str, Any]:
+        """Write the index as magic | header length | 0 | JSON header (8-byte padded) | postings"""
+        header, blob = self.build()
+        encoded = json.dumps(header, separators=(",", ":")).encode()
+        encoded += b" " * (aligned(PREAMBLE.size + len(encoded)) - PREAMBLE.size - len(encoded))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_suffix(".tmp"), 'wb') as f:
+            f.write(PREAMBLE.pack(MAGIC, len(encoded), 0) + encoded + blob)
+        self.path.with_suffix(".tmp").replace(self.path)
+        return header
+
+def write_index(config: seed.SeedConfig, path: Path,
+                progress: Optional[Callable[[str, int, int], None]] = None) -> Dict[str, Any]:
+    """Generate the dataset into a search index only and write it to path"""
+    return seed.run_sinks(config, [IndexSink(config, path)], progress)[0]
+
+class SearchIndex:
+    """Query side, mirroring searchIndex.ts (used by the benchmark)"""
+    def __init__(self, path: Path):
+        data = np.fromfile(path, dtype=np.uint8)
+        magic, header_length, _ = PREAMBLE.unpack(data[:PREAMBLE.size].tobytes())
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a search index")
+        self.header = json.loads(data[PREAMBLE.size:PREAMBLE.size + header_length].tobytes())
+        self.postings = data[PREAMBLE.size + header_length:]
+        self.lowered = {table: [term.lower() for term in info["terms"]] for table, info in self.header["tables"].items()}
+
+    def term_postings(self, table: str, terms: List[int]) -> np.ndarray:
+        """Ordinals of every record holding any of terms (ascending per term, not merged)"""
+        info = self.header["tables"][table]
+        base = info["postings"]
+        # Varints are self-delimiting: decode all the ranges in one pass
+        gaps = decode_varints(np.concatenate([self.postings[base + info["offsets"][term]:
+                                                             base + info["offsets"][term + 1]] for term in terms]))
+        running = np.cumsum(gaps, dtype=np.uint64)
+        counts = np.array([info["counts"][term] for term in terms])
+        ends = np.cumsum(counts)
+        # Restart the running sum at each term's first gap
+        before = np.concatenate(([0], running[ends[:-1] - 1])).astype(np.uint64)
+        return (running - np.repeat(before, counts)).astype(np.uint32)
+
+    def query_terms(self, table: str, needle: str) -> List[int]:
+        """Ids of the terms containing needle (lowercase)"""
+        info = self.header["tables"][table]
+        if len(needle) < 3:
+            return [term for term, text in enumerate(self.lowered[table]) if needle in text]
+        candidates: Optional[set] = None
+        for gram in sorted({needle[i:i + 3] for i in range(len(needle) - 2)},
+                           key=lambda gram: len(info["trigrams"].get(gram, []))):
+            terms = info["trigrams"].get(gram)
+            if not terms:
+                return []
+            candidates = set(terms) if candidates is None else candidates.intersection(terms)
+        return sorted(term for term in candidates or () if needle in self.lowered[table][term])
+
+    def search(self, table: str, query: str) -> Optional[np.ndarray]:
+        """Sorted ordinals of the records with query in one term, as the scans match; None for an empty query"""
+        if not query:
+            return None
+        terms = self.query_terms(table, query.lower())
+        if not terms:
+            return np.empty(0, dtype=np.uint32)
+        return np.unique(self.term_postings(table, terms))
+
+def naive_records(config: seed.SeedConfig) -> List[Tuple[str, List[str]]]:
+    """(name, conditions) of every patient, for the scan-per-query baseline"""
+    records = []
+    for table, batch, columns in seed.generate_columns(config):
+        if table != "patients":
+            continue
+        for gender, first, last, conditions in zip(columns["gender"].tolist(), columns["first_name"].tolist(),
+                                                   columns["last_name"].tolist(), columns["conditions"].tolist()):
+            records.append((f"{seed.FIRST_NAMES[seed.GENDERS[gender]][first]} {seed.LAST_NAMES[last]}",
+                            [seed.MEDICAL_CONDITIONS[code] for code in conditions if code >= 0]))
+    return records
+
+def naive_search(records: List[Tuple[str, List[str]]], query: str) -> int:
+    """searchPatients from mockDatabase.ts: lowercase everything on every query"""
+    needle = query.lower()
+    return sum(1 for name, conditions in records
+               if needle in name.lower() or any(needle in condition.lower() for condition in conditions))
+
+def benchmark(sizes: List[int], rounds: int = 20, seed_value: int = 0) -> List[Dict[str, Any]]:
+    """Build, load and query indexes at each size; compare with the linear scan"""
+    results = []
+    with tempfile.TemporaryDirectory() as scratch:
+        for patients in sizes:
+            config = seed.SeedConfig.for_patients(patients, seed_value)
+            path = Path(scratch) / f"search-{patients}.bin"
+            start = time.perf_counter()
+            write_index(config, path)
+            build = time.perf_counter() - start
+            start = time.perf_counter()
+            index = SearchIndex(path)
+            load = time.perf_counter() - start
+            records = naive_records(config)
+            for query in BENCHMARK_QUERIES:
+                timings = []
+                for _ in range(rounds):
+                    start = time.perf_counter()
+                    matches = index.search("patients", query)
+                    timings.append(time.perf_counter() - start)
+                scan_rounds = max(1, min(rounds, 2_000_000 // max(patients, 1)))
+                scans = []
+                for _ in range(scan_rounds):
+                    start = time.perf_counter()
+                    scan_matches = naive_search(records, query)
+                    scans.append(time.perf_counter() - start)
+                results.append({
+                    "patients": patients, "query": query, "matches": 0 if matches is None else len(matches),
+                    "scan_matches": scan_matches,
+                    "index_ms": statistics.median(timings) * 1000, "scan_ms": statistics.median(scans) * 1000,
+                    "build_s": build, "load_ms": load * 1000, "bytes": path.stat().st_size,
+                })
+    return results
+
+def format_benchmark(results: List[Dict[str, Any]]) -> str:
+    lines = []
+    for patients in sorted({result["patients"] for result in results}):
+        rows = [result for result in results if result["patients"] == patients]
+        lines.append(f"{patients:,} patients: index {rows[0]['bytes'] / 1024:,.0f} KiB, built in "
+                     f"{rows[0]['build_s']:.2f}s, loaded in {rows[0]['load_ms']:.1f} ms")
+        lines.append(f"  {'query':<16} {'matches':>10} {'index':>11} {'scan':>11} {'speedup':>8}")
+        for row in rows:
+            lines.append(f"  {row['query']:<16} {row['matches']:>10,} {row['index_ms']:>8.3f} ms "
+                         f"{row['scan_ms']:>8.1f} ms {row['scan_ms'] / max(row['index_ms'], 1e-6):>7.0f}x")
+    return "\n".join(lines)
+
+def main():
+    """Write an index, or benchmark queries at several dataset sizes"""
+    if len(sys.argv) > 1 and sys.argv[1] == "--benchmark":
+        sizes = [int(size) for size in sys.argv[2:]] or [10_000, 100_000, 1_000_000]
+        print(format_benchmark(benchmark(sizes)))
+        return
+    patients = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    seed_value = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    out = Path(sys.argv[3]) if len(sys.argv) > 3 else Path("database/generated/search-index.bin")
+    start = time.perf_counter()
+    write_index(seed.SeedConfig.for_patients(patients, seed_value), out)
+    print(f"Wrote {out.stat().st_size / 1024:,.0f} KiB search index for {patients:,} patients "
+          f"to {out} in {time.perf_counter() - start:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,566 @@
+#!/usr/bin/env python3
+"""
+MediMinder AI - Seeded mock dataset generator
+
+Generates hospitals, doctors and patients with the shapes from types.ts and
+the value distributions of database/mockDatabase.ts, but sampled column-wise
+with NumPy instead of object by object. Rows are produced in fixed-size
+batches, each with its own generator derived from (seed, table, batch), so
+the output depends only on the seed and the counts: not on batch order, the
+number of worker processes or the machine. Memory stays bounded by the batch
+size whatever the patient count.
+
+Requires numpy (pip install numpy).
+
+Usage: python -m database.seed [PATIENTS] [SEED]
+"""
+
+import datetime
+import functools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+# Rows per batch. Part of the seed -> data mapping: changing it changes the data.
+BATCH_SIZE = 1 << 16
+TABLE_CODES = {"hospitals": 1, "doctors": 2, "patients": 3}
+
+# Vocabularies, in the same order as database/mockDatabase.ts
+MEDICAL_CONDITIONS = [
+    'Type 2 Diabetes', 'Hypertension', 'Hyperlipidemia', 'Asthma', 'COPD', 'Depression',
+    'Anxiety Disorder', 'Osteoarthritis', 'Rheumatoid Arthritis', 'Coronary Artery Disease',
+    'Heart Failure', 'Atrial Fibrillation', 'Stroke', 'Chronic Kidney Disease', 'Hypothyroidism',
+    'Gastroesophageal Reflux', 'Migraine', 'Epilepsy', "Parkinson's Disease", "Alzheimer's Disease",
+]
+# (name, dosages, category, conditions)
+MEDICATIONS = [
+    ('Metformin', ['500mg', '850mg', '1000mg'], 'Antidiabetic', ['Type 2 Diabetes']),
+    ('Lisinopril', ['5mg', '10mg', '20mg'], 'ACE Inhibitor', ['Hypertension', 'Heart Failure']),
+    ('Atorvastatin', ['10mg', '20mg', '40mg', '80mg'], 'Statin', ['Hyperlipidemia']),
+    ('Amlodipine', ['2.5mg', '5mg', '10mg'], 'Calcium Channel Blocker', ['Hypertension']),
+    ('Omeprazole', ['20mg', '40mg'], 'Proton Pump Inhibitor', ['Gastroesophageal Reflux']),
+    ('Levothyroxine', ['25mcg', '50mcg', '75mcg', '100mcg', '125mcg'], 'Thyroid Hormone', ['Hypothyroidism']),
+    ('Sertraline', ['25mg', '50mg', '100mg'], 'SSRI', ['Depression', 'Anxiety Disorder']),
+    ('Albuterol', ['90mcg/inhaler'], 'Bronchodilator', ['Asthma', 'COPD']),
+    ('Warfarin', ['1mg', '2mg', '5mg'], 'Anticoagulant', ['Atrial Fibrillation', 'Stroke']),
+    ('Furosemide', ['20mg', '40mg', '80mg'], 'Diuretic', ['Heart Failure', 'Hypertension']),
+    ('Aspirin', ['81mg', '325mg'], 'Antiplatelet', ['Coronary Artery Disease', 'Stroke']),
+    ('Ibuprofen', ['200mg', '400mg', '600mg'], 'NSAID', ['Osteoarthritis', 'Rheumatoid Arthritis']),
+    ('Sumatriptan', ['25mg', '50mg', '100mg'], 'Triptan', ['Migraine']),
+    ('Phenytoin', ['100mg', '200mg'], 'Anticonvulsant', ['Epilepsy']),
+    ('Carbidopa-Levodopa', ['25-100mg', '25-250mg'], 'Dopamine Precursor', ["Parkinson's Disease"]),
+]
+MEDICAL_SPECIALTIES = [
+    'Internal Medicine', 'Family Medicine', 'Cardiology', 'Endocrinology', 'Pulmonology',
+    'Gastroenterology', 'Nephrology', 'Neurology', 'Psychiatry', 'Rheumatology',
+    'Dermatology', 'Ophthalmology', 'Orthopedics', 'Urology', 'Oncology',
+    'Emergency Medicine', 'Anesthesiology', 'Radiology', 'Pathology', 'Surgery',
+]
+HOSPITAL_NAMES = [
+    'Apollo Hospital', 'Fortis Healthcare', 'Max Super Speciality Hospital', 'Medanta - The Medicity',
+    'AIIMS (All India Institute of Medical Sciences)', 'Christian Medical College', 'Tata Memorial Hospital',
+    'Sankara Nethralaya', 'Narayana Health', 'Manipal Hospital', 'Columbia Asia Hospital',
+    'Kokilaben Dhirubhai Ambani Hospital', 'Sir Ganga Ram Hospital', 'Ruby Hall Clinic',
+    'Breach Candy Hospital', 'Jaslok Hospital', 'Hinduja Hospital', 'Lilavati Hospital',
+    'King Edward Memorial Hospital', 'Seth G.S. Medical College', 'Grant Medical College',
+    'Lokmanya Tilak Municipal Medical College', 'Topiwala National Medical College',
+]
+INDIAN_CITIES = [
+    'Mumbai', 'Delhi', 'Bangalore', 'Chennai', 'Kolkata', 'Hyderabad', 'Pune', 'Ahmedabad',
+    'Jaipur', 'Lucknow', 'Kanpur', 'Nagpur', 'Visakhapatnam', 'Indore', 'Thane',
+    'Bhopal', 'Patna', 'Vadodara', 'Ghaziabad', 'Ludhiana', 'Coimbatore', 'Madurai',
+]
+FIRST_NAMES = {
+    'male': ['Aarav', 'Vivaan', 'Aditya', 'Vihaan', 'Arjun', 'Sai', 'Reyansh', 'Ayaan', 'Krishna', 'Ishaan',
+             'Atharv', 'Advaith', 'Arnav', 'Aadi', 'Kiaan', 'Shivansh', 'Abhinav', 'Prathvik', 'Aayan', 'Rudra'],
+    'female': ['Saanvi', 'Aanya', 'Aadhya', 'Aaradhya', 'Ananya', 'Pari', 'Diya', 'Myra', 'Anika', 'Avni',
+               'Kavya', 'Arya', 'Sia', 'Riya', 'Kiara', 'Aditi', 'Ira', 'Tara', 'Shreya', 'Priya'],
+}
+GENDERS = ['male', 'female']
+# Stride of first_name_codes (the snapshot and search index name dictionaries)
+FIRST_NAMES_PER_GENDER = len(FIRST_NAMES['male'])
+assert all(len(names) == FIRST_NAMES_PER_GENDER for names in FIRST_NAMES.values()), \
+    "every gender needs the same number of first names"
+LAST_NAMES = ['Sharma', 'Verma', 'Singh', 'Kumar', 'Gupta', 'Patel', 'Jain', 'Agarwal', 'Yadav', 'Shah',
+              'Mehta', 'Reddy', 'Naidu', 'Rao', 'Iyer', 'Menon', 'Nair', 'Pillai', 'Chandra', 'Varma']
+FREQUENCIES = ['Once daily', 'Twice daily', 'Three times daily']
+SCHEDULE_TIMES = [['8:00 AM'], ['8:00 AM', '8:00 PM'], ['8:00 AM', '2:00 PM', '8:00 PM']]
+COMPLIANCE_STATUSES = ['Compliant', 'Partial', 'Non-Compliant']
+BLOOD_GROUPS = ['A+', 'A-', 'B+', 'B-', 'AB+', 'AB-', 'O+', 'O-']
+RELATIONS = ['Spouse', 'Father', 'Mother', 'Son', 'Daughter', 'Brother', 'Sister']
+STREETS = ['MG Road', 'Park Street', 'Brigade Road', 'Commercial Street']
+ADDRESS_KINDS = ['Sector', 'Block', 'Phase']
+HOSPITAL_TYPES = ['Multi-specialty', 'Super-specialty', 'Teaching Hospital', 'Government Hospital', 'Private Hospital']
+ACCREDITATIONS = ['NABH', 'JCI', 'ISO 9001', 'NABL']
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
+MAX_CONDITIONS = 3
+
+# Per condition, the medications that treat it (flattened: offset/count into CONDITION_MEDS)
+CONDITION_MEDS = np.array([index for condition in MEDICAL_CONDITIONS
+                           for index, med in enumerate(MEDICATIONS) if condition in med[3]], dtype=np.int16)
+CONDITION_MED_COUNT = np.array([sum(condition in med[3] for med in MEDICATIONS)
+                                for condition in MEDICAL_CONDITIONS], dtype=np.int16)
+CONDITION_MED_OFFSET = (np.cumsum(CONDITION_MED_COUNT) - CONDITION_MED_COUNT).astype(np.int16)
+DOSAGE_COUNT = np.array([len(med[1]) for med in MEDICATIONS], dtype=np.int16)
+
+class SeedConfig(NamedTuple):
+    """What to generate; the data is a pure function of these fields"""
+    seed: int
+    hospitals: int
+    doctors: int
+    patients: int
+    reference_date: str = "2025-01-01"  # "today" for lastVisit / nextAppointment
+
+    @classmethod
+    def for_patients(cls, patients: int, seed: int = 0, doctors: Optional[int] = None,
+                     hospitals: Optional[int] = None, reference_date: str = "2025-01-01") -> "SeedConfig":
+        """Fill in doctor and hospital counts with mockDatabase.ts' ratios (4 patients/doctor, 10 doctors/hospital)"""
+        doctors = doctors or max(1, patients // 4)
+        hospitals = hospitals or max(1, doctors // 10)
+        return cls(seed, hospitals, doctors, patients, reference_date)
+
+def first_name_codes(columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """First names as indexes into every gender's FIRST_NAMES concatenated in GENDERS order"""
+    return columns["gender"].astype(np.int32) * FIRST_NAMES_PER_GENDER + columns["first_name"]
+
+def batch_rng(config: SeedConfig, table: str, batch: int) -> np.random.Generator:
+    return np.random.Generator(np.random.PCG64(np.random.SeedSequence([config.seed, TABLE_CODES[table], batch])))
+
+def batch_ranges(count: int) -> List[Tuple[int, int]]:
+    return [(start, min(start + BATCH_SIZE, count)) for start in range(0, count, BATCH_SIZE)]
+
+def distinct_codes(rng: np.random.Generator, size: int, vocabulary: int, picks: int) -> np.ndarray:
+    """size x picks distinct codes from range(vocabulary), uniformly (like a shuffle-and-slice)
+
+    Each pick is drawn from the remaining values and shifted past the codes
+    already taken, which avoids materialising a size x vocabulary shuffle.
+    """
+    codes = np.empty((size, picks), dtype=np.int16)
+    for pick in range(picks):
+        value = rng.integers(0, vocabulary - pick, size=size).astype(np.int16)
+        taken = np.sort(codes[:, :pick], axis=1)
+        for column in range(pick):
+            value += value >= taken[:, column]
+        codes[:, pick] = value
+    return codes
+
+def phone_numbers(rng: np.random.Generator, size: int) -> np.ndarray:
+    return rng.integers(1_000_000_000, 10_000_000_000, size=size, dtype=np.int64)
+
+def hospital_columns(config: SeedConfig, batch: int) -> Dict[str, np.ndarray]:
+    start, end = batch_ranges(config.hospitals)[batch]
+    size = end - start
+    rng = batch_rng(config, "hospitals", batch)
+    department_count = rng.integers(8, 19, size=size)
+    departments = np.argsort(rng.random((size, len(MEDICAL_SPECIALTIES)), dtype=np.float32), axis=1).astype(np.int8)
+    accreditation_count = rng.integers(1, 4, size=size)
+    accreditations = np.argsort(rng.random((size, len(ACCREDITATIONS)), dtype=np.float32), axis=1).astype(np.int8)
+    return {
+        "name": rng.integers(0, len(HOSPITAL_NAMES), size=size, dtype=np.int8),
+        "city": rng.integers(0, len(INDIAN_CITIES), size=size, dtype=np.int8),
+        "address_number": rng.integers(1, 1000, size=size, dtype=np.int16),
+        "address_kind": rng.integers(0, len(ADDRESS_KINDS), size=size, dtype=np.int8),
+        "address_block": rng.integers(1, 51, size=size, dtype=np.int8),
+        "type": rng.integers(0, len(HOSPITAL_TYPES), size=size, dtype=np.int8),
+        "established": rng.integers(1970, 2020, size=size, dtype=np.int16),
+        "bed_capacity": rng.integers(200, 1000, size=size, dtype=np.int16),
+        # Rows of a per-hospital shuffle; the first *_count entries are used
+        "departments": departments,
+        "department_count": department_count.astype(np.int8),
+        "accreditations": accreditations,
+        "accreditation_count": accreditation_count.astype(np.int8),
+        "contact_number": phone_numbers(rng, size),
+        "emergency_number": phone_numbers(rng, size),
+    }
+
+def doctor_columns(config: SeedConfig, batch: int) -> Dict[str, np.ndarray]:
+    start, end = batch_ranges(config.doctors)[batch]
+    size = end - start
+    rng = batch_rng(config, "doctors", batch)
+    # 30% female doctors, as in mockDatabase.ts
+    female = (rng.random(size) > 0.7).astype(np.int8)
+    specialty = rng.integers(0, len(MEDICAL_SPECIALTIES), size=size, dtype=np.int8)
+    qualifications = rng.random((size, 3))
+    availability = rng.random((size, len(WEEKDAYS), 2))
+    return {
+        "hospital": rng.integers(0, config.hospitals, size=size, dtype=np.int32),
+        "gender": female,
+        "first_name": rng.integers(0, 20, size=size, dtype=np.int8),
+        "last_name": rng.integers(0, len(LAST_NAMES), size=size, dtype=np.int8),
+        "specialty": specialty,
+        "years": rng.integers(5, 30, size=size, dtype=np.int8),
+        "has_md": qualifications[:, 0] > 0.3,
+        "has_frcp": qualifications[:, 1] > 0.7,
+        "has_dnb": qualifications[:, 2] > 0.8,
+        "fee": rng.integers(500, 2000, size=size, dtype=np.int16),
+        # Per weekday: has slots at all, and whether the afternoon slot is free
+        "has_slots": availability[:, :, 0] > 0.2,
+        "afternoon_free": availability[:, :, 1] > 0.3,
+        "contact_number": phone_numbers(rng, size),
+        "license": rng.integers(100000, 1000000, size=size, dtype=np.int32),
+        "rating": np.floor((3.5 + rng.random(size) * 1.5) * 10 + 0.5).astype(np.int8),  # tenths
+    }
+
+def doctor_hospitals(config: SeedConfig) -> np.ndarray:
+    """Hospital index of every doctor: an array lookup instead of hospitals.find"""
+    return np.concatenate([doctor_columns(config, batch)["hospital"]
+                           for batch in range(len(batch_ranges(config.doctors)))])
+
+def patient_columns(config: SeedConfig, batch: int, hospital_of_doctor: np.ndarray) -> Dict[str, np.ndarray]:
+    start, end = batch_ranges(config.patients)[batch]
+    size = end - start
+    rng = batch_rng(config, "patients", batch)
+    doctor = rng.integers(0, config.doctors, size=size, dtype=np.int32)
+    gender = (rng.random(size) > 0.5).astype(np.int8)  # 0 male, 1 female
+    age = (25 + rng.integers(0, 55, size=size)).astype(np.int8)
+    condition_count = np.where(age > 60, rng.integers(1, 4, size=size), rng.integers(1, 3, size=size)).astype(np.int8)
+    conditions = distinct_codes(rng, size, len(MEDICAL_CONDITIONS), MAX_CONDITIONS)
+    used = np.arange(MAX_CONDITIONS) < condition_count[:, None]
+    conditions = np.where(used, conditions, -1).astype(np.int8)
+
+    # One medication per condition that has any, as in generateRealisticPatient
+    safe = np.maximum(conditions, 0)
+    med_count = np.where(used, CONDITION_MED_COUNT[safe], 0)
+    med_pick = (rng.random((size, MAX_CONDITIONS)) * np.maximum(med_count, 1)).astype(np.int16)
+    # Clipped so conditions without medications (masked out below) still index in bounds
+    med_index = np.minimum(CONDITION_MED_OFFSET[safe] + med_pick, len(CONDITION_MEDS) - 1)
+    medication = np.where(med_count > 0, CONDITION_MEDS[med_index], -1).astype(np.int8)
+    safe_med = np.maximum(medication, 0)
+    dosage = (rng.random((size, MAX_CONDITIONS)) * DOSAGE_COUNT[safe_med]).astype(np.int8)
+    frequency = rng.integers(0, 3, size=(size, MAX_CONDITIONS), dtype=np.int8)  # doses/day - 1
+    # Bit d set = dose d taken (80% each)
+    taken_bits = ((rng.random((size, MAX_CONDITIONS, 3)) > 0.2) * np.array([1, 2, 4])).sum(axis=2).astype(np.int8)
+    doses = np.arange(3)
+    scheduled = (doses[None, None, :] <= frequency[:, :, None]) & (medication[:, :, None] >= 0)
+    taken = (taken_bits[:, :, None] >> doses[None, None, :]) & 1
+    taken_bits = np.where(scheduled, taken, 0).astype(np.int8) @ np.array([1, 2, 4], dtype=np.int8)
+    total = scheduled.sum(axis=(1, 2))
+    taken_total = (taken * scheduled).sum(axis=(1, 2))
+    # Math.round: half up
+    compliance = np.where(total > 0, np.floor(taken_total * 100 / np.maximum(total, 1) + 0.5), 100).astype(np.int8)
+    status = np.select([compliance >= 90, compliance >= 70], [0, 1], 2).astype(np.int8)
+
+    last_name = rng.integers(0, len(LAST_NAMES), size=size, dtype=np.int8)
+    return {
+        "doctor": doctor,
+        "hospital": hospital_of_doctor[doctor],
+        "gender": gender,
+        "first_name": rng.integers(0, 20, size=size, dtype=np.int8),
+        "last_name": last_name,
+        "age": age,
+        "conditions": conditions,
+        "medication": medication,
+        "dosage": dosage,
+        "frequency": frequency,
+        "taken_bits": taken_bits,
+        "compliance": compliance,
+        "status": status,
+        # Days before / after the reference date
+        "last_visit": rng.integers(0, 60, size=size, dtype=np.int16),
+        "next_appointment": rng.integers(0, 8, size=size, dtype=np.int16),
+        "contact_number": phone_numbers(rng, size),
+        "address_number": rng.integers(1, 1000, size=size, dtype=np.int16),
+        "street": rng.integers(0, len(STREETS), size=size, dtype=np.int8),
+        "city": rng.integers(0, len(INDIAN_CITIES), size=size, dtype=np.int8),
+        "blood_group": rng.integers(0, len(BLOOD_GROUPS), size=size, dtype=np.int8),
+        "emergency_first_name": rng.integers(0, 20, size=size, dtype=np.int8),
+        "emergency_relation": rng.integers(0, len(RELATIONS), size=size, dtype=np.int8),
+        "emergency_phone": phone_numbers(rng, size),
+    }
+
+# JSON serialisation: each row is assembled from pre-encoded fragments
+
+def quoted(values: List[str]) -> List[str]:
+    return [json.dumps(value) for value in values]
+
+def date_strings(reference: str, offsets: range) -> List[str]:
+    day = datetime.date.fromisoformat(reference)
+    return [json.dumps((day + datetime.timedelta(days=offset)).isoformat()) for offset in offsets]
+
+class PatientEncoder:
+    """Turn patient columns into one JSON object per line (Patient in types.ts)"""
+    def __init__(self, config: SeedConfig):
+        self.first = [quoted(FIRST_NAMES[gender]) for gender in GENDERS]
+        self.first_lower = [[name.lower() for name in FIRST_NAMES[gender]] for gender in GENDERS]
+        self.last = quoted(LAST_NAMES)
+        self.last_lower = [name.lower() for name in LAST_NAMES]
+        self.genders = quoted(GENDERS)
+        self.conditions = quoted(MEDICAL_CONDITIONS)
+        self.statuses = quoted(COMPLIANCE_STATUSES)
+        self.blood = quoted(BLOOD_GROUPS)
+        self.relations = quoted(RELATIONS)
+        self.last_visit = date_strings(config.reference_date, range(0, -60, -1))
+        self.next_appointment = date_strings(config.reference_date, range(0, 8))
+        self.addresses = [[json.dumps(f", {street}, {city}")[1:] for city in INDIAN_CITIES] for street in STREETS]
+        self.medications: Dict[Tuple[int, int, int, int, int], str] = {}
+
+    def medication(self, med: int, dosage: int, frequency: int, condition: int, taken_bits: int) -> str:
+        key = (med, dosage, frequency, condition, taken_bits)
+        cached = self.medications.get(key)
+        if cached is None:
+            name, dosages, category, _ = MEDICATIONS[med]
+            cached = self.medications[key] = json.dumps({
+                "name": name,
+                "dosage": dosages[dosage],
+                "schedule": [{"time": time_of_day, "taken": bool(taken_bits >> index & 1)}
+                             for index, time_of_day in enumerate(SCHEDULE_TIMES[frequency])],
+                "instructions": f"Take {FREQUENCIES[frequency].lower()} with food. "
+                                f"{category} for {MEDICAL_CONDITIONS[condition]}.",
+                "category": category,
+                "condition": MEDICAL_CONDITIONS[condition],
+            }, separators=(",", ":"))
+        return cached
+
+    def lines(self, start: int, columns: Dict[str, np.ndarray]) -> List[str]:
+        # Plain Python lists index far faster than NumPy scalars
+        rows = {name: column.tolist() for name, column in columns.items()}
+        lines = []
+        for row in range(len(rows["doctor"])):
+            gender = rows["gender"][row]
+            first = rows["first_name"][row]
+            last = rows["last_name"][row]
+            conditions = [code for code in rows["conditions"][row] if code >= 0]
+            medications = ",".join(
+                self.medication(med, rows["dosage"][row][slot], rows["frequency"][row][slot],
+                                rows["conditions"][row][slot], rows["taken_bits"][row][slot])
+                for slot, med in enumerate(rows["medication"][row]) if med >= 0)
+            lines.append(
+                f'{{"id":"patient{start + row + 1}","name":"{FIRST_NAMES[GENDERS[gender]][first]} {LAST_NAMES[last]}",'
+                f'"age":{rows["age"][row]},"gender":{self.genders[gender]},'
+                f'"lastVisit":{self.last_visit[rows["last_visit"][row]]},'
+                f'"nextAppointment":{self.next_appointment[rows["next_appointment"][row]]},'
+                f'"compliance":"{rows["compliance"][row]}%","complianceStatus":{self.statuses[rows["status"][row]]},'
+                f'"doctorId":"doctor{rows["doctor"][row] + 1}","hospitalId":"hospital{rows["hospital"][row] + 1}",'
+                f'"medications":[{medications}],'
+                f'"medicalConditions":[{",".join(self.conditions[code] for code in conditions)}],'
+                f'"contactNumber":"+91 {rows["contact_number"][row]}",'
+                f'"email":"{self.first_lower[gender][first]}.{self.last_lower[last]}@email.com",'
+                f'"address":"{rows["address_number"][row]}{self.addresses[rows["street"][row]][rows["city"][row]]},'
+                f'"bloodGroup":{self.blood[rows["blood_group"][row]]},'
+                f'"emergencyContact":{{"name":"{FIRST_NAMES["male"][rows["emergency_first_name"][row]]} {LAST_NAMES[last]}",'
+                f'"relation":{self.relations[rows["emergency_relation"][row]]},'
+                f'"phone":"+91 {rows["emergency_phone"][row]}"}}}}')
+        return lines
+
+AVAILABILITY_PLACEHOLDER = "@@availability@@"
+
+@functools.lru_cache(maxsize=None)
+def availability_json(has_slots: Tuple[bool, ...], afternoon_free: Tuple[bool, ...]) -> str:
+    """Weekly availability (at most 2^12 distinct values, so each is encoded once)"""
+    return json.dumps([{"day": day, "slots": [{"time": "9:00 AM - 12:00 PM", "available": True},
+                                              {"time": "2:00 PM - 5:00 PM", "available": free}] if has else []}
+                       for day, has, free in zip(WEEKDAYS, has_slots, afternoon_free)], separators=(",", ":"))
+
+def doctor_lines(start: int, columns: Dict[str, np.ndarray]) -> List[str]:
+    """One JSON object per line (Doctor in types.ts)"""
+    rows = {name: column.tolist() for name, column in columns.items()}
+    lines = []
+    for row in range(len(rows["hospital"])):
+        gender = GENDERS[rows["gender"][row]]
+        first = FIRST_NAMES[gender][rows["first_name"][row]]
+        last = LAST_NAMES[rows["last_name"][row]]
+        specialty = MEDICAL_SPECIALTIES[rows["specialty"][row]]
+        qualifications = (["MBBS"] + ([f"MD ({specialty})"] if rows["has_md"][row] else [])
+                          + (["FRCP"] if rows["has_frcp"][row] else []) + (["DNB"] if rows["has_dnb"][row] else []))
+        lines.append(json.dumps({
+            "id": f"doctor{start + row + 1}",
+            "name": f"Dr. {first} {last}",
+            "gender": gender,
+            "specialty": specialty,
+            "hospitalId": f"hospital{rows['hospital'][row] + 1}",
+            "yearsOfExperience": rows["years"][row],
+            "qualifications": ", ".join(qualifications),
+            "consultationFee": rows["fee"][row],
+            "availability": AVAILABILITY_PLACEHOLDER,
+            "contactNumber": f"+91 {rows['contact_number'][row]}",
+            "email": f"dr.{first.lower()}.{last.lower()}@hospital.com",
+            "licenseNumber": f"DL{rows['license'][row]}",
+            "rating": rows["rating"][row] / 10,
+        }, separators=(",", ":")).replace(f'"{AVAILABILITY_PLACEHOLDER}"', availability_json(
+            tuple(rows["has_slots"][row]), tuple(rows["afternoon_free"][row]))))
+    return lines
+
+def hospital_lines(start: int, columns: Dict[str, np.ndarray]) -> List[str]:
+    """One JSON object per line (Hospital in types.ts)
+
+    doctors and patients are left empty: at this scale they are linked by
+    hospitalId rather than embedded.
+    """
+    rows = {name: column.tolist() for name, column in columns.items()}
+    lines = []
+    for row in range(len(rows["name"])):
+        name = HOSPITAL_NAMES[rows["name"][row]]
+        city = INDIAN_CITIES[rows["city"][row]]
+        domain = "".join(name.lower().split())
+        lines.append(json.dumps({
+            "id": f"hospital{start + row + 1}",
+            "name": name,
+            "location": city,
+            "address": f"{rows['address_number'][row]}, {ADDRESS_KINDS[rows['address_kind'][row]]} "
+                       f"{rows['address_block'][row]}, {city}",
+            "type": HOSPITAL_TYPES[rows["type"][row]],
+            "established": rows["established"][row],
+            "bedCapacity": rows["bed_capacity"][row],
+            "departments": [MEDICAL_SPECIALTIES[code] for code in rows["departments"][row][:rows["department_count"][row]]],
+            "accreditation": [ACCREDITATIONS[code] for code in rows["accreditations"][row][:rows["accreditation_count"][row]]],
+            "contactNumber": f"+91 {rows['contact_number'][row]}",
+            "email": f"info@{domain}.com",
+            "website": f"www.{domain}.com",
+            "emergencyNumber": f"+91 {rows['emergency_number'][row]}",
+            "doctors": [],
+            "patients": [],
+        }, separators=(",", ":")))
+    return lines
+
+# Worker-process state: built once per process by init_worker
+_worker: Dict[str, Any] = {}
+
+def init_worker(config: SeedConfig):
+    _worker["config"] = config
+    _worker["hospital_of_doctor"] = doctor_hospitals(config) if config.patients else None
+    _worker["encoder"] = PatientEncoder(config)
+
+def batch_lines(table: str, batch: int, keep: Tuple[str, ...] = ()
+                ) -> Tuple[List[str], np.ndarray, Dict[str, int], Dict[str, np.ndarray]]:
+    """Lines of one batch, the hospital index of each line, per-batch tallies and the keep columns (in a worker)"""
+    config = _worker["config"]
+    start, end = batch_ranges(getattr(config, table))[batch]
+    tallies: Dict[str, int] = {}
+    if table == "hospitals":
+        columns = hospital_columns(config, batch)
+        lines, hospitals = hospital_lines(start, columns), np.arange(start, end)
+    elif table == "doctors":
+        columns = doctor_columns(config, batch)
+        lines, hospitals = doctor_lines(start, columns), columns["hospital"]
+    else:
+        columns = patient_columns(config, batch, _worker["hospital_of_doctor"])
+        counts = np.bincount(columns["status"], minlength=len(COMPLIANCE_STATUSES))
+        tallies = dict(zip(COMPLIANCE_STATUSES, counts.tolist()))
+        lines, hospitals = _worker["encoder"].lines(start, columns), columns["hospital"]
+    return lines, hospitals, tallies, {name: columns[name] for name in keep}
+
+def encode_batch(task: Tuple[str, int, Tuple[str, ...]]) -> Tuple[bytes, Dict[str, int], Dict[str, np.ndarray]]:
+    """Generate and serialise one batch; returns NDJSON bytes, per-batch tallies and the columns sinks read"""
+    lines, _, tallies, columns = batch_lines(*task)
+    return ("\n".join(lines) + "\n").encode(), tallies, columns
+
+def ordered_results(pool: ProcessPoolExecutor, fn: Callable, tasks: List[Any], window: int) -> Iterator[Any]:
+    """fn(task) for every task, in order, with at most window tasks queued or unconsumed"""
+    pending = []
+    submitted = 0
+    for _ in range(len(tasks)):
+        while submitted < len(tasks) and len(pending) < window:
+            pending.append(pool.submit(fn, tasks[submitted]))
+            submitted += 1
+        yield pending.pop(0).result()
+
+def generate_columns(config: SeedConfig) -> Iterator[Tuple[str, int, Dict[str, np.ndarray]]]:
+    """Every batch of every table as NumPy columns, without serialising anything"""
+    for batch in range(len(batch_ranges(config.hospitals))):
+        yield "hospitals", batch, hospital_columns(config, batch)
+    hospital_of_doctor = []
+    for batch in range(len(batch_ranges(config.doctors))):
+        columns = doctor_columns(config, batch)
+        hospital_of_doctor.append(columns["hospital"])
+        yield "doctors", batch, columns
+    lookup = np.concatenate(hospital_of_doctor)
+    for batch in range(len(batch_ranges(config.patients))):
+        yield "patients", batch, patient_columns(config, batch, lookup)
+
+# A sink consumes the generated batches alongside whichever writer produces
+# them, so one generation pass can feed several outputs: columns names the
+# columns it reads per table, add(table, batch, columns) receives each batch
+# in table order and finish() writes its output.
+
+def sink_columns(sinks: List[Any]) -> Dict[str, Tuple[str, ...]]:
+    """Columns of each table that any of sinks reads (workers send back only these)"""
+    needed: Dict[str, Tuple[str, ...]] = {}
+    for sink in sinks:
+        for table, names in sink.columns.items():
+            needed[table] = tuple(sorted(set(needed.get(table, ())) | set(names)))
+    return needed
+
+def feed_sinks(sinks: List[Any], table: str, batch: int, columns: Dict[str, np.ndarray]):
+    for sink in sinks:
+        if table in sink.columns:
+            sink.add(table, batch, columns)
+
+def run_sinks(config: SeedConfig, sinks: List[Any],
+              progress: Optional[Callable[[str, int, int], None]] = None) -> List[Any]:
+    """Generate in-process into sinks alone; returns each sink's finish()"""
+    for table, batch, columns in generate_columns(config):
+        feed_sinks(sinks, table, batch, columns)
+        if progress:
+            progress(table, batch + 1, len(batch_ranges(getattr(config, table))))
+    return [sink.finish() for sink in sinks]
+
+def dataset_meta(config: SeedConfig, statuses: Dict[str, int], timings: Dict[str, float]) -> Dict[str, Any]:
+    """Totals and averages shared by meta.json and the shard manifest"""
+    return {
+        "seed": config.seed,
+        "referenceDate": config.reference_date,
+        "batchSize": BATCH_SIZE,
+        "totalHospitals": config.hospitals,
+        "totalDoctors": config.doctors,
+        "totalPatients": config.patients,
+        "avgPatientsPerDoctor": round(config.patients / config.doctors),
+        "avgDoctorsPerHospital": round(config.doctors / config.hospitals),
+        "complianceStatus": statuses,
+        "seconds": timings,
+    }
+
+def write_dataset(config: SeedConfig, out_dir: Path, jobs: Optional[int] = None,
+                  progress: Optional[Callable[[str, int, int], None]] = None,
+                  sinks: Optional[List[Any]] = None) -> Dict[str, Any]:
+    """Write hospitals/doctors/patients.ndjson and meta.json into out_dir
+
+    Batches are generated and serialised on a process pool; at most
+    2 x jobs finished batches wait to be written, in order. Each batch is
+    also fed to sinks (see sink_columns); finishing them is up to the caller.
+    """
+    sinks = sinks or []
+    keep = sink_columns(sinks)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    statuses = dict.fromkeys(COMPLIANCE_STATUSES, 0)
+    timings = {}
+    jobs = jobs or os.cpu_count() or 1
+    window = 2 * jobs
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker, initargs=(config,)) as pool:
+        for table in ("hospitals", "doctors", "patients"):
+            start = time.perf_counter()
+            batches = len(batch_ranges(getattr(config, table)))
+            path = out_dir / f"{table}.ndjson"
+            with open(path.with_suffix(".tmp"), 'wb') as f:
+                tasks = [(table, batch, keep.get(table, ())) for batch in range(batches)]
+                for done, (data, tallies, columns) in enumerate(ordered_results(pool, encode_batch, tasks, window)):
+                    f.write(data)
+                    feed_sinks(sinks, table, done, columns)
+                    for status, count in tallies.items():
+                        statuses[status] += count
+                    if progress:
+                        progress(table, done + 1, batches)
+            path.with_suffix(".tmp").replace(path)
+            timings[table] = round(time.perf_counter() - start, 3)
+    meta = dataset_meta(config, statuses, timings)
+    with open(out_dir / "meta.json", 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+def main():
+    """Generate columns only and report throughput (no files written)"""
+    patients = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    config = SeedConfig.for_patients(patients, seed)
+    start = time.perf_counter()
+    rows = sum(len(next(iter(columns.values()))) for _, _, columns in generate_columns(config))
+    elapsed = time.perf_counter() - start
+    print(f"Generated {rows:,} rows ({patients:,} patients) in {elapsed:.2f}s ({rows / elapsed:,.0f} rows/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+import type { Hospital, Doctor, Patient } from '../types';
+
+// Lazy loader for the per-hospital shards written by `setup_dev.py seed --shards`
+// (database/shards.py). Only the manifest and the shards a view asks for are
+// fetched, so page load and memory do not grow with the number of hospitals.
+// Doctor and patient logins find their hospital's shard through the owners
+// pages (the hospital index of every record), and the hospital list is read
+// from the hospital pages (the columns it shows, with doctor and patient counts).
+
+export interface DatasetManifest {
+  version: number;
+  seed: number;
+  referenceDate: string;
+  totalHospitals: number;
+  totalDoctors: number;
+  totalPatients: number;
+  avgPatientsPerDoctor: number;
+  avgDoctorsPerHospital: number;
+  complianceStatus: Record<string, number>;
+  shards: {
+    path: string;
+    perDirectory: number;
+    count: number;
+    bytes: number;
+    largestBytes: number;
+  };
+  owners: {
+    path: string;
+    perPage: number;
+  };
+  hospitals: {
+    path: string;
+    perPage: number;
+    pages: number;
+  };
+}
+
+// hospitals/<page>.json: one entry per hospital in each array, from hospital number first + 1
+interface HospitalPage {
+  first: number;
+  name: string[];
+  location: string[];
+  type: string[];
+  bedCapacity: number[];
+  established: number[];
+  doctors: number[];
+  patients: number[];
+}
+
+export type PersonTable = 'doctors' | 'patients';
+
+export interface HospitalShard {
+  hospital: Hospital;
+  doctors: Doctor[];
+  patients: Patient[];
+}
+
+// Set by setup_dev.py when database/generated/manifest.json exists
+const DATASET_URL: string = import.meta.env.VITE_DATASET_URL || '';
+
+// Shards kept in memory; older ones are dropped and refetched (the browser cache usually answers)
+const MAX_CACHED_SHARDS = 8;
+
+let manifestRequest: Promise<DatasetManifest> | null = null;
+const shardRequests = new Map<string, Promise<HospitalShard>>();
+// Only logins read these, so the few pages fetched are simply kept
+const ownerPages = new Map<string, Promise<DataView>>();
+
+export const isShardedDatasetEnabled = () => DATASET_URL !== '';
+
+const datasetUrl = (path: string) => `${DATASET_URL.replace(/\/?$/, '/')}${path}`;
+
+export const loadManifest = (): Promise<DatasetManifest> => {
+  if (!manifestRequest) {
+    manifestRequest = fetch(datasetUrl('manifest.json')).then(response => {
+      if (!response.ok) {
+        throw new Error(`Failed to load dataset manifest: HTTP ${response.status}`);
+      }
+      return response.json() as Promise<DatasetManifest>;
+    });
+    manifestRequest.catch(() => { manifestRequest = null; });
+  }
+  return manifestRequest;
+};
+
+// A hospital known only by its ID until its shard loads (see useHospitalShard)
+export const hospitalStub = (hospitalId: string): Hospital => ({
+  id: hospitalId,
+  name: `Hospital ${hospitalId.replace(/^hospital/, '')}`,
+  location: '',
+  doctors: [],
+  patients: [],
+});
+
+const loadHospitalPage = async (manifest: DatasetManifest, page: number): Promise<Hospital[]> => {
+  const response = await fetch(datasetUrl(manifest.hospitals.path.replace('{page}', String(page))));
+  if (!response.ok) {
+    throw new Error(`Failed to load hospital page ${page}: HTTP ${response.status}`);
+  }
+  const columns = await response.json() as HospitalPage;
+  return columns.name.map((name, row) => ({
+    id: `hospital${columns.first + row + 1}`,
+    name,
+    location: columns.location[row],
+    type: columns.type[row],
+    bedCapacity: columns.bedCapacity[row],
+    established: columns.established[row],
+    doctors: [],
+    patients: [],
+    doctorCount: columns.doctors[row],
+    patientCount: columns.patients[row],
+  }));
+};
+
+// Every hospital of the dataset from the hospital pages (shards are not fetched)
+export const loadHospitalList = async (): Promise<Hospital[]> => {
+  const manifest = await loadManifest();
+  const pages = Array.from({ length: manifest.hospitals.pages }, (_, page) => loadHospitalPage(manifest, page));
+  return (await Promise.all(pages)).flat();
+};
+
+export const shardPath = (manifest: DatasetManifest, hospitalId: string) => {
+  const index = Number(hospitalId.replace(/^hospital/, '')) - 1;
+  return manifest.shards.path
+    .replace('{directory}', String(Math.floor(index / manifest.shards.perDirectory)))
+    .replace('{hospitalId}', hospitalId);
+};
+
+// Parse NDJSON as it arrives instead of buffering the whole response text
+async function* ndjsonRecords(response: Response): AsyncGenerator<any> {
+  const reader = response.body!.getReader();
+  const decoder = new TextDecoder();
+  let buffered = '';
+  for (;;) {
+    const { done, value } = await reader.read();
+    buffered += decoder.decode(value, { stream: !done });
+    const lines = buffered.split('\n');
+    buffered = done ? '' : lines.pop()!;
+    for (const line of lines) {
+      if (line) yield JSON.parse(line);
+    }
+    if (done) return;
+  }
+}
+
+const fetchShard = async (hospitalId: string): Promise<HospitalShard> => {
+  const manifest = await loadManifest();
+  const response = await fetch(datasetUrl(shardPath(manifest, hospitalId)));
+  if (!response.ok) {
+    throw new Error(`Failed to load shard for ${hospitalId}: HTTP ${response.status}`);
+  }
+  // Line order is fixed: the hospital, then its doctors, then its patients
+  let hospital: Hospital | undefined;
+  const doctors: Doctor[] = [];
+  const patients: Patient[] = [];
+  for await (const record of ndjsonRecords(response)) {
+    if (!hospital) hospital = record as Hospital;
+    else if (record.id.startsWith('doctor')) doctors.push(record as Doctor);
+    else patients.push(record as Patient);
+  }
+  if (!hospital) {
+    throw new Error(`Shard for ${hospitalId} is empty`);
+  }
+  hospital.doctors = doctors;
+  hospital.patients = patients;
+  return { hospital, doctors, patients };
+};
+
+// Concurrent calls for the same hospital share one request
+export const loadHospitalShard = (hospitalId: string): Promise<HospitalShard> => {
+  let request = shardRequests.get(hospitalId);
+  if (request) {
+    // Most recently used goes last
+    shardRequests.delete(hospitalId);
+  } else {
+    const pending = fetchShard(hospitalId);
+    pending.catch(() => {
+      if (shardRequests.get(hospitalId) === pending) shardRequests.delete(hospitalId);
+    });
+    request = pending;
+  }
+  shardRequests.set(hospitalId, request);
+  while (shardRequests.size > MAX_CACHED_SHARDS) {
+    shardRequests.delete(shardRequests.keys().next().value!);
+  }
+  return request;
+};
+
+export const loadDoctorsByHospital = async (hospitalId: string) =>
+  (await loadHospitalShard(hospitalId)).doctors;
+
+export const loadPatientsByHospital = async (hospitalId: string) =>
+  (await loadHospitalShard(hospitalId)).patients;
+
+export const evictHospitalShard = (hospitalId: string) => shardRequests.delete(hospitalId);
+
+const loadOwnerPage = (manifest: DatasetManifest, table: PersonTable, page: number): Promise<DataView> => {
+  const path = manifest.owners.path.replace('{table}', table).replace('{page}', String(page));
+  let request = ownerPages.get(path);
+  if (!request) {
+    const pending = fetch(datasetUrl(path)).then(async response => {
+      if (!response.ok) {
+        throw new Error(`Failed to load ${table} page ${page}: HTTP ${response.status}`);
+      }
+      return new DataView(await response.arrayBuffer());
+    });
+    pending.catch(() => ownerPages.delete(path));
+    ownerPages.set(path, pending);
+    request = pending;
+  }
+  return request;
+};
+
+// ID of the hospital whose shard holds a doctor or patient; null for IDs outside the dataset
+export const ownerHospitalId = async (table: PersonTable, id: string): Promise<string | null> => {
+  const prefix = table === 'doctors' ? 'doctor' : 'patient';
+  const manifest = await loadManifest();
+  const index = id.startsWith(prefix) ? Number(id.slice(prefix.length)) - 1 : -1;
+  const total = table === 'doctors' ? manifest.totalDoctors : manifest.totalPatients;
+  if (!Number.isInteger(index) || index < 0 || index >= total) {
+    return null;
+  }
+  const page = await loadOwnerPage(manifest, table, Math.floor(index / manifest.owners.perPage));
+  return `hospital${page.getUint32((index % manifest.owners.perPage) * 4, true) + 1}`;
+};
+
+export const findDoctor = async (doctorId: string): Promise<Doctor | null> => {
+  const hospitalId = await ownerHospitalId('doctors', doctorId);
+  return hospitalId ? (await loadDoctorsByHospital(hospitalId)).find(doctor => doctor.id === doctorId) ?? null : null;
+};
+
+export const findPatient = async (patientId: string): Promise<Patient | null> => {
+  const hospitalId = await ownerHospitalId('patients', patientId);
+  return hospitalId ? (await loadPatientsByHospital(hospitalId)).find(patient => patient.id === patientId) ?? null : null;
+};
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+MediMinder AI - Per-hospital dataset shards
+
+Exports the seeded dataset of database/seed.py as one NDJSON file per
+hospital (its Hospital line, then its doctors, then its patients) plus a
+manifest.json of constant size, so the app can fetch only the hospitals a
+view shows (database/shardLoader.ts). owners/ maps every doctor and patient
+to its hospital, so a login can find its shard, and hospitals/ lists every
+hospital with its doctor and patient counts for the Super Admin table.
+
+Rows come out of the generator in table order, not hospital order, so the
+export is an external group-by in two streaming passes:
+
+1. Batches are serialised on a process pool and each line is appended to
+   one of at most MAX_PARTITIONS partition files by hospital range.
+2. Each partition (about PARTITION_BYTES) is read, stably sorted by hospital
+   and cut into shards. Partitions cover hospital ranges in order, so the
+   summary rows they return are written as hospital pages as they arrive.
+
+Memory is bounded by the batch window and one partition per worker, never
+by the number of hospitals or patients.
+
+Requires numpy (pip install numpy).
+
+Usage: python -m database.shards [PATIENTS] [SEED] [OUT_DIR]
+"""
+
+import itertools
+import json
+import math
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from database import seed
+
+MANIFEST_VERSION = 3
+# Keeps any one directory listable; shard i lives in shards/<i // SHARDS_PER_DIRECTORY>/
+SHARDS_PER_DIRECTORY = 1000
+# Pass-1 files stay open together, so stay well under the usual 1024 descriptor limit
+MAX_PARTITIONS = 256
+PARTITION_BYTES = 32 << 20
+# Rough serialised sizes, only used to pick the partition count
+ESTIMATED_LINE_BYTES = {"hospitals": 700, "doctors": 1300, "patients": 1100}
+# owners/<table>/<page>.bin: one page per generated batch
+OWNERS_PER_PAGE = seed.BATCH_SIZE
+# hospitals/<page>.json: the columns the hospital list shows, for this many hospitals
+HOSPITALS_PER_PAGE = 5000
+HOSPITAL_PAGE_FIELDS = ("name", "location", "type", "bedCapacity", "established")
+
+def partition_count(config: seed.SeedConfig) -> int:
+    estimate = sum(getattr(config, table) * size for table, size in ESTIMATED_LINE_BYTES.items())
+    return max(1, min(config.hospitals, MAX_PARTITIONS, math.ceil(estimate / PARTITION_BYTES)))
+
+def shard_path(hospital: int) -> str:
+    """Path of a hospital's shard (0-based index) relative to the output directory"""
+    return f"shards/{hospital // SHARDS_PER_DIRECTORY}/hospital{hospital + 1}.ndjson"
+
+def owner_path(table: str, page: int) -> str:
+    """Path of a page of doctor or patient hospital indexes relative to the output directory"""
+    return f"owners/{table}/{page}.bin"
+
+def hospital_page_path(page: int) -> str:
+    return f"hospitals/{page}.json"
+
+def write_hospital_page(out_dir: Path, page: int, rows: List[Tuple[Any, ...]]):
+    """One page of hospital summary rows as columns: the fields, then doctor and patient counts"""
+    columns = list(zip(*rows))
+    data = {"first": page * HOSPITALS_PER_PAGE, **dict(zip(HOSPITAL_PAGE_FIELDS + ("doctors", "patients"), columns))}
+    path = out_dir / hospital_page_path(page)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(",", ":"))
+
+class OwnerSink:
+    """Writes each batch's hospital indexes as little-endian uint32 as it arrives (a seed sink with nothing to finish)"""
+    columns = {"doctors": ("hospital",), "patients": ("hospital",)}
+
+    def __init__(self, out_dir: Path):
+        self.out_dir = out_dir
+
+    def add(self, table: str, batch: int, columns: Dict[str, np.ndarray]):
+        path = self.out_dir / owner_path(table, batch)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(columns["hospital"].astype("<u4").tobytes())
+
+def partition_batch(task: Tuple[str, int, int, Tuple[str, ...]]
+                    ) -> Tuple[Dict[int, bytes], Dict[str, int], Dict[str, np.ndarray]]:
+    """Serialise one batch (in a seed.init_worker process) as "hospital<TAB>json" lines per partition"""
+    table, batch, partitions, keep = task
+    lines, hospitals, tallies, columns = seed.batch_lines(table, batch, keep)
+    partition_of = (hospitals.astype(np.int64) * partitions // seed._worker["config"].hospitals).tolist()
+    hospitals = hospitals.tolist()
+    grouped: Dict[int, List[str]] = {}
+    for line, hospital, partition in zip(lines, hospitals, partition_of):
+        grouped.setdefault(partition, []).append(f"{hospital}\t{line}\n")
+    return {partition: "".join(group).encode() for partition, group in grouped.items()}, tallies, columns
+
+def partitioned_batches(config: seed.SeedConfig, pool: ProcessPoolExecutor, partitions: int, window: int,
+                        keep: Dict[str, Tuple[str, ...]]
+                        ) -> Iterator[Tuple[str, int, int, Dict[int, bytes], Dict[str, int], Dict[str, np.ndarray]]]:
+    """(table, batches done, batches, blobs by partition, tallies, keep columns) for every batch, in table order"""
+    for table in ("hospitals", "doctors", "patients"):
+        batches = len(seed.batch_ranges(getattr(config, table)))
+        tasks = [(table, batch, partitions, keep.get(table, ())) for batch in range(batches)]
+        for done, (blobs, tallies, columns) in enumerate(seed.ordered_results(pool, partition_batch, tasks, window)):
+            yield table, done + 1, batches, blobs, tallies, columns
+
+def shard_groups(partition: Path) -> Iterator[Tuple[int, List[bytes]]]:
+    """(hospital, JSON lines) of every hospital in a partition file, in hospital order
+
+    The sort is stable, so each group keeps table order: hospital, doctors, patients.
+    """
+    with open(partition, 'rb') as f:
+        lines = f.readlines()
+    lines.sort(key=lambda line: int(line[:line.index(b"\t")]))
+    for hospital, group in itertools.groupby(lines, key=lambda line: int(line[:line.index(b"\t")])):
+        yield hospital, [line[line.index(b"\t") + 1:] for line in group]
+
+def write_partition_shards(task: Tuple[str, str]) -> Tuple[int, int, int, List[Tuple[Any, ...]]]:
+    """Write the shards of one partition file, then delete it
+
+    Returns (shards, bytes, largest, summary rows): one row per hospital, in
+    hospital order, with HOSPITAL_PAGE_FIELDS and its doctor and patient counts.
+    """
+    partition, shard_dir = task
+    shards = total = largest = 0
+    rows = []
+    for hospital, lines in shard_groups(Path(partition)):
+        path = Path(shard_dir) / shard_path(hospital)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = b"".join(lines)
+        with open(path, 'wb') as f:
+            f.write(data)
+        shards += 1
+        total += len(data)
+        largest = max(largest, len(data))
+        record = json.loads(lines[0])
+        doctors = sum(line.startswith(b'{"id":"doctor') for line in lines)
+        rows.append((*(record[field] for field in HOSPITAL_PAGE_FIELDS), doctors, len(lines) - 1 - doctors))
+    os.unlink(partition)
+    return shards, total, largest, rows
+
+def export_shards(config: seed.SeedConfig, out_dir: Path, jobs: Optional[int] = None,
+                  progress: Optional[Callable[[str, int, int], None]] = None,
+                  sinks: Optional[List[Any]] = None) -> Dict[str, Any]:
+    """Write shards/, owners/, hospitals/ and manifest.json into out_dir, replacing a previous export
+
+    Each batch is also fed to sinks (see seed.sink_columns); finishing them
+    is up to the caller.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    staging = out_dir / "shards.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir()
+    sinks = [OwnerSink(staging), *(sinks or [])]
+    statuses = dict.fromkeys(seed.COMPLIANCE_STATUSES, 0)
+    timings = {}
+    jobs = jobs or os.cpu_count() or 1
+    partitions = partition_count(config)
+    partition_paths = [staging / f"partition{index}.tsv" for index in range(partitions)]
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=seed.init_worker, initargs=(config,)) as pool:
+        start = time.perf_counter()
+        files = [open(path, 'wb') for path in partition_paths]
+        try:
+            generated = partitioned_batches(config, pool, partitions, 2 * jobs, seed.sink_columns(sinks))
+            for table, done, batches, blobs, tallies, columns in generated:
+                for partition, data in blobs.items():
+                    files[partition].write(data)
+                seed.feed_sinks(sinks, table, done - 1, columns)
+                for status, count in tallies.items():
+                    statuses[status] += count
+                if progress:
+                    progress(table, done, batches)
+        finally:
+            for f in files:
+                f.close()
+        timings["partition"] = round(time.perf_counter() - start, 3)
+
+        start = time.perf_counter()
+        shards = total = largest = pages = 0
+        pending: List[Tuple[Any, ...]] = []
+        tasks = [(str(path), str(staging)) for path in partition_paths]
+        for done, (count, size, biggest, rows) in enumerate(pool.map(write_partition_shards, tasks)):
+            shards += count
+            total += size
+            largest = max(largest, biggest)
+            pending.extend(rows)
+            while len(pending) >= HOSPITALS_PER_PAGE or (pending and done + 1 == partitions):
+                write_hospital_page(staging, pages, pending[:HOSPITALS_PER_PAGE])
+                del pending[:HOSPITALS_PER_PAGE]
+                pages += 1
+            if progress:
+                progress("shards", done + 1, partitions)
+        timings["shards"] = round(time.perf_counter() - start, 3)
+
+    for name in ("shards", "owners", "hospitals"):
+        shutil.rmtree(out_dir / name, ignore_errors=True)
+        (staging / name).replace(out_dir / name)
+    staging.rmdir()
+    manifest = {"version": MANIFEST_VERSION, **seed.dataset_meta(config, statuses, timings), "shards": {
+        "path": "shards/{directory}/{hospitalId}.ndjson",
+        "perDirectory": SHARDS_PER_DIRECTORY,
+        "count": shards,
+        "bytes": total,
+        "largestBytes": largest,
+    }, "owners": {
+        "path": "owners/{table}/{page}.bin",
+        "perPage": OWNERS_PER_PAGE,
+    }, "hospitals": {
+        "path": "hospitals/{page}.json",
+        "perPage": HOSPITALS_PER_PAGE,
+        "pages": pages,
+    }}
+    with open(out_dir / "manifest.tmp", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    (out_dir / "manifest.tmp").replace(out_dir / "manifest.json")
+    return manifest
+
+def main():
+    """Export a sharded dataset and report its size"""
+    patients = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    seed_value = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    out = Path(sys.argv[3]) if len(sys.argv) > 3 else Path("database/generated")
+    manifest = export_shards(seed.SeedConfig.for_patients(patients, seed_value), out)
+    shards = manifest["shards"]
+    print(f"Wrote {shards['count']:,} shards ({shards['bytes'] / (1 << 20):,.1f} MiB, largest "
+          f"{shards['largestBytes'] / 1024:,.0f} KiB) to {out} in {sum(manifest['seconds'].values()):.1f}s")
+
+if __name__ == "__main__":
+    main()
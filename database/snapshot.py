@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+MediMinder AI - Columnar binary dataset snapshot
+
+Writes the seeded dataset of database/seed.py as one file of little-endian
+typed columns that the app can view in place (database/snapshotReader.ts)
+instead of parsing or generating an object per record. Categorical fields
+(compliance status, specialty, location, medication names, ...) are
+dictionary-encoded as uint8 codes; IDs are stored as uint32 ordinals
+(doctor 41 -> "doctor42"), dates as int32 days since 1970-01-01.
+
+Layout:
+
+    magic "MMSNAP01" | uint32 header length | uint32 0 | JSON header
+    (space-padded to 8 bytes) | columns, each 8-byte aligned
+
+Column offsets in the header are relative to the end of the header. Per-row
+lists (conditions, medications) have a fixed width of MAX_CONDITIONS slots,
+with NONE marking unused slots, so every column size is known up front and
+batches are written straight into a memory map.
+
+Requires numpy (pip install numpy).
+
+Usage: python -m database.snapshot [PATIENTS] [SEED] [OUT_FILE]
+"""
+
+import datetime
+import json
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from database import seed
+
+MAGIC = b"MMSNAP01"
+VERSION = 1
+PREAMBLE = struct.Struct("<8sII")
+ALIGNMENT = 8
+NONE = 255  # empty slot in a dictionary-coded list column
+
+DICTIONARIES: Dict[str, List[str]] = {
+    "hospitalName": seed.HOSPITAL_NAMES,
+    "hospitalType": seed.HOSPITAL_TYPES,
+    "location": seed.INDIAN_CITIES,
+    "specialty": seed.MEDICAL_SPECIALTIES,
+    "gender": seed.GENDERS,
+    # Codes from seed.first_name_codes, as names are drawn per gender
+    "firstName": [name for gender in seed.GENDERS for name in seed.FIRST_NAMES[gender]],
+    "lastName": seed.LAST_NAMES,
+    "complianceStatus": seed.COMPLIANCE_STATUSES,
+    "medicalCondition": seed.MEDICAL_CONDITIONS,
+    "medication": [med[0] for med in seed.MEDICATIONS],
+    # Parallel to "medication"
+    "medicationCategory": [med[2] for med in seed.MEDICATIONS],
+    "dosage": sorted({dosage for med in seed.MEDICATIONS for dosage in med[1]}),
+    "bloodGroup": seed.BLOOD_GROUPS,
+}
+# (medication, dosage index within that medication) -> "dosage" code
+DOSAGE_CODES = np.array([[DICTIONARIES["dosage"].index(med[1][index]) if index < len(med[1]) else NONE
+                          for index in range(max(seed.DOSAGE_COUNT))] for med in seed.MEDICATIONS], dtype=np.uint8)
+
+class Column(NamedTuple):
+    name: str
+    dtype: str  # numpy name, also the JS typed array element type
+    values: Callable[[Dict[str, np.ndarray]], np.ndarray]
+    width: int = 1
+    dictionary: Optional[str] = None
+
+def coded(values: np.ndarray) -> np.ndarray:
+    """Dictionary codes with -1 (empty slot) mapped to NONE"""
+    return np.where(values < 0, NONE, values).astype(np.uint8)
+
+def epoch_days(reference_date: str) -> int:
+    return (datetime.date.fromisoformat(reference_date) - datetime.date(1970, 1, 1)).days
+
+def table_columns(config: seed.SeedConfig) -> Dict[str, List[Column]]:
+    reference = epoch_days(config.reference_date)
+    return {
+        "hospitals": [
+            Column("name", "uint8", lambda c: c["name"], dictionary="hospitalName"),
+            Column("location", "uint8", lambda c: c["city"], dictionary="location"),
+            Column("type", "uint8", lambda c: c["type"], dictionary="hospitalType"),
+            Column("established", "uint16", lambda c: c["established"]),
+            Column("bedCapacity", "uint16", lambda c: c["bed_capacity"]),
+        ],
+        "doctors": [
+            Column("hospital", "uint32", lambda c: c["hospital"]),
+            Column("specialty", "uint8", lambda c: c["specialty"], dictionary="specialty"),
+            Column("gender", "uint8", lambda c: c["gender"], dictionary="gender"),
+            Column("firstName", "uint8", seed.first_name_codes, dictionary="firstName"),
+            Column("lastName", "uint8", lambda c: c["last_name"], dictionary="lastName"),
+            Column("yearsOfExperience", "uint8", lambda c: c["years"]),
+            Column("consultationFee", "uint16", lambda c: c["fee"]),
+            Column("rating", "float32", lambda c: c["rating"] / 10),
+        ],
+        "patients": [
+            Column("doctor", "uint32", lambda c: c["doctor"]),
+            Column("hospital", "uint32", lambda c: c["hospital"]),
+            Column("age", "uint8", lambda c: c["age"]),
+            Column("gender", "uint8", lambda c: c["gender"], dictionary="gender"),
+            Column("firstName", "uint8", seed.first_name_codes, dictionary="firstName"),
+            Column("lastName", "uint8", lambda c: c["last_name"], dictionary="lastName"),
+            Column("compliance", "uint8", lambda c: c["compliance"]),  # percent
+            Column("complianceStatus", "uint8", lambda c: c["status"], dictionary="complianceStatus"),
+            Column("lastVisit", "int32", lambda c: reference - c["last_visit"].astype(np.int32)),
+            Column("nextAppointment", "int32", lambda c: reference + c["next_appointment"].astype(np.int32)),
+            Column("conditions", "uint8", lambda c: coded(c["conditions"]), seed.MAX_CONDITIONS, "medicalCondition"),
+            Column("medications", "uint8", lambda c: coded(c["medication"]), seed.MAX_CONDITIONS, "medication"),
+            Column("dosages", "uint8", lambda c: np.where(c["medication"] < 0, NONE, DOSAGE_CODES[
+                np.maximum(c["medication"], 0), c["dosage"]]), seed.MAX_CONDITIONS, "dosage"),
+            # Doses per day, 0 for an empty slot; bit d of takenBits = dose d taken
+            Column("dosesPerDay", "uint8", lambda c: np.where(c["medication"] < 0, 0, c["frequency"] + 1),
+                   seed.MAX_CONDITIONS),
+            Column("takenBits", "uint8", lambda c: c["taken_bits"], seed.MAX_CONDITIONS),
+            Column("bloodGroup", "uint8", lambda c: c["blood_group"], dictionary="bloodGroup"),
+            Column("city", "uint8", lambda c: c["city"], dictionary="location"),
+            Column("contactNumber", "float64", lambda c: c["contact_number"]),  # 10 digits: exact in a double
+        ],
+    }
+
+def aligned(size: int) -> int:
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+def layout(config: seed.SeedConfig) -> Dict[str, Any]:
+    """The JSON header: dictionaries plus every column's type, width and offset"""
+    offset = 0
+    tables = {}
+    for table, columns in table_columns(config).items():
+        rows = getattr(config, table)
+        described = {}
+        for column in columns:
+            described[column.name] = {"type": column.dtype, "offset": offset, "width": column.width}
+            if column.dictionary:
+                described[column.name]["dictionary"] = column.dictionary
+            offset += aligned(rows * column.width * np.dtype(column.dtype).itemsize)
+        tables[table] = {"rows": rows, "columns": described}
+    return {
+        "version": VERSION,
+        "seed": config.seed,
+        "referenceDate": config.reference_date,
+        "dataBytes": offset,
+        "dictionaries": DICTIONARIES,
+        "tables": tables,
+    }
+
+def write_snapshot(config: seed.SeedConfig, path: Path,
+                   progress: Optional[Callable[[str, int, int], None]] = None,
+                   sinks: Optional[List[Any]] = None) -> Dict[str, Any]:
+    """Generate the dataset batch by batch straight into a memory-mapped snapshot file
+
+    Each batch is also fed to sinks (see seed.sink_columns); finishing them
+    is up to the caller.
+    """
+    header = layout(config)
+    encoded = json.dumps(header, separators=(",", ":")).encode()
+    encoded += b" " * (aligned(PREAMBLE.size + len(encoded)) - PREAMBLE.size - len(encoded))
+    data_start = PREAMBLE.size + len(encoded)
+    total = data_start + header["dataBytes"]
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging = path.with_suffix(".tmp")
+    with open(staging, 'wb') as f:
+        f.write(PREAMBLE.pack(MAGIC, len(encoded), 0) + encoded)
+        f.truncate(total)
+    columns = table_columns(config)
+    if header["dataBytes"]:
+        data = np.memmap(staging, dtype=np.uint8, mode="r+", offset=data_start, shape=(header["dataBytes"],))
+        for table, batch, values in seed.generate_columns(config):
+            start, end = seed.batch_ranges(getattr(config, table))[batch]
+            for column in columns[table]:
+                info = header["tables"][table]["columns"][column.name]
+                dtype = np.dtype(column.dtype).newbyteorder("<")
+                view = data[info["offset"]:info["offset"] + getattr(config, table) * column.width * dtype.itemsize]
+                view.view(dtype).reshape(-1, column.width)[start:end] = \
+                    np.asarray(column.values(values)).reshape(end - start, column.width)
+            seed.feed_sinks(sinks or [], table, batch, values)
+            if progress:
+                progress(table, batch + 1, len(seed.batch_ranges(getattr(config, table))))
+        data.flush()
+        del data
+    staging.replace(path)
+    return header
+
+def open_snapshot(path: Path) -> Dict[str, Dict[str, np.ndarray]]:
+    """Read-only memory-mapped views of every column: {table: {column: rows or rows x width}}"""
+    with open(path, 'rb') as f:
+        magic, header_length, _ = PREAMBLE.unpack(f.read(PREAMBLE.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a dataset snapshot")
+        header = json.loads(f.read(header_length))
+    data_start = PREAMBLE.size + header_length
+    tables = {}
+    for table, described in header["tables"].items():
+        rows = described["rows"]
+        tables[table] = {}
+        for name, info in described["columns"].items():
+            dtype = np.dtype(info["type"]).newbyteorder("<")
+            shape = (rows, info["width"]) if info["width"] > 1 else (rows,)
+            tables[table][name] = np.memmap(path, dtype=dtype, mode="r", shape=shape,
+                                            offset=data_start + info["offset"]) if rows else np.empty(shape, dtype)
+    return tables
+
+def main():
+    """Write a snapshot and report its size"""
+    patients = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    seed_value = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    out = Path(sys.argv[3]) if len(sys.argv) > 3 else Path("database/generated/dataset.snapshot")
+    start = time.perf_counter()
+    write_snapshot(seed.SeedConfig.for_patients(patients, seed_value), out)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {out.stat().st_size / (1 << 20):,.1f} MiB snapshot of {patients:,} patients "
+          f"to {out} in {elapsed:.2f}s")
+
+if __name__ == "__main__":
+    main()
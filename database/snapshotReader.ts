@@ -0,0 +1,168 @@
+import type { ComplianceStatus, Medication, Patient } from '../types';
+
+// Reader for the columnar snapshots written by `setup_dev.py seed --snapshot`
+// (database/snapshot.py). Columns are typed-array views over the one
+// ArrayBuffer, so opening a snapshot allocates no per-record objects; a
+// Patient is only built when a view asks for that row.
+
+type ColumnType = 'uint8' | 'uint16' | 'uint32' | 'int32' | 'float32' | 'float64';
+type Column = Uint8Array | Uint16Array | Uint32Array | Int32Array | Float32Array | Float64Array;
+
+interface ColumnInfo {
+  type: ColumnType;
+  offset: number;
+  width: number;
+  dictionary?: string;
+}
+
+export interface SnapshotHeader {
+  version: number;
+  seed: number;
+  referenceDate: string;
+  dataBytes: number;
+  dictionaries: Record<string, string[]>;
+  tables: Record<string, { rows: number; columns: Record<string, ColumnInfo> }>;
+}
+
+export interface SnapshotTable {
+  rows: number;
+  // Row r of a column with width w is at [r * w, (r + 1) * w)
+  columns: Record<string, Column>;
+  info: Record<string, ColumnInfo>;
+}
+
+export interface Snapshot {
+  header: SnapshotHeader;
+  dictionaries: Record<string, string[]>;
+  hospitals: SnapshotTable;
+  doctors: SnapshotTable;
+  patients: SnapshotTable;
+}
+
+const MAGIC = 'MMSNAP01';
+const PREAMBLE_BYTES = 16;
+// Empty slot in a dictionary-coded list column (conditions, medications)
+export const NONE = 255;
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+const ARRAY_TYPES = {
+  uint8: Uint8Array,
+  uint16: Uint16Array,
+  uint32: Uint32Array,
+  int32: Int32Array,
+  float32: Float32Array,
+  float64: Float64Array,
+};
+
+const littleEndian = new Uint8Array(new Uint16Array([1]).buffer)[0] === 1;
+
+export const readSnapshot = (buffer: ArrayBuffer): Snapshot => {
+  const preamble = new DataView(buffer, 0, PREAMBLE_BYTES);
+  const magic = new TextDecoder().decode(new Uint8Array(buffer, 0, 8));
+  if (magic !== MAGIC) {
+    throw new Error('Not a MediMinder dataset snapshot');
+  }
+  if (!littleEndian) {
+    throw new Error('Dataset snapshots need a little-endian platform');
+  }
+  const headerBytes = preamble.getUint32(8, true);
+  const header: SnapshotHeader = JSON.parse(
+    new TextDecoder().decode(new Uint8Array(buffer, PREAMBLE_BYTES, headerBytes)));
+  const dataStart = PREAMBLE_BYTES + headerBytes;
+
+  const table = (name: string): SnapshotTable => {
+    const { rows, columns: info } = header.tables[name];
+    const columns: Record<string, Column> = {};
+    for (const [column, { type, offset, width }] of Object.entries(info)) {
+      columns[column] = new ARRAY_TYPES[type](buffer, dataStart + offset, rows * width);
+    }
+    return { rows, columns, info };
+  };
+
+  return {
+    header,
+    dictionaries: header.dictionaries,
+    hospitals: table('hospitals'),
+    doctors: table('doctors'),
+    patients: table('patients'),
+  };
+};
+
+export const loadSnapshot = async (url: string): Promise<Snapshot> => {
+  const response = await fetch(url);
+  if (!response.ok) {
+    throw new Error(`Failed to load dataset snapshot: HTTP ${response.status}`);
+  }
+  return readSnapshot(await response.arrayBuffer());
+};
+
+// Decoded value of a dictionary-coded column (slot is for list columns)
+export const decode = (snapshot: Snapshot, table: SnapshotTable, column: string, row: number, slot = 0) => {
+  const code = table.columns[column][row * table.info[column].width + slot];
+  return code === NONE ? undefined : snapshot.dictionaries[table.info[column].dictionary!][code];
+};
+
+const isoDate = (epochDays: number) => new Date(epochDays * DAY_MS).toISOString().slice(0, 10);
+
+const SCHEDULE_TIMES = [['8:00 AM'], ['8:00 AM', '8:00 PM'], ['8:00 AM', '2:00 PM', '8:00 PM']];
+const FREQUENCIES = ['Once daily', 'Twice daily', 'Three times daily'];
+
+// Counts straight off the uint8 column: no strings compared, nothing allocated per row
+export const complianceCounts = (snapshot: Snapshot): Record<ComplianceStatus, number> => {
+  const codes = snapshot.patients.columns.complianceStatus;
+  const counts = new Uint32Array(snapshot.dictionaries.complianceStatus.length);
+  for (let row = 0; row < codes.length; row++) {
+    counts[codes[row]]++;
+  }
+  const result = {} as Record<ComplianceStatus, number>;
+  snapshot.dictionaries.complianceStatus.forEach((status, code) => {
+    result[status as ComplianceStatus] = counts[code];
+  });
+  return result;
+};
+
+// One patient as the Patient type (address, email and emergency contact are not in snapshots)
+export const patientAt = (snapshot: Snapshot, row: number): Patient => {
+  const { columns } = snapshot.patients;
+  const names = snapshot.dictionaries;
+  const medications: Medication[] = [];
+  const conditions: string[] = [];
+  for (let slot = 0; slot < snapshot.patients.info.conditions.width; slot++) {
+    const index = row * snapshot.patients.info.conditions.width + slot;
+    if (columns.conditions[index] !== NONE) {
+      conditions.push(names.medicalCondition[columns.conditions[index]]);
+    }
+    const medication = columns.medications[index];
+    if (medication === NONE) continue;
+    const doses = columns.dosesPerDay[index];
+    const category = names.medicationCategory[medication];
+    const condition = names.medicalCondition[columns.conditions[index]];
+    medications.push({
+      name: names.medication[medication],
+      dosage: names.dosage[columns.dosages[index]],
+      schedule: SCHEDULE_TIMES[doses - 1].map((time, dose) => ({
+        time,
+        taken: ((columns.takenBits[index] >> dose) & 1) === 1,
+      })),
+      instructions: `Take ${FREQUENCIES[doses - 1].toLowerCase()} with food. ${category} for ${condition}.`,
+      category,
+      condition,
+    });
+  }
+  return {
+    id: `patient${row + 1}`,
+    name: `${names.firstName[columns.firstName[row]]} ${names.lastName[columns.lastName[row]]}`,
+    age: columns.age[row],
+    gender: names.gender[columns.gender[row]],
+    lastVisit: isoDate(columns.lastVisit[row]),
+    nextAppointment: isoDate(columns.nextAppointment[row]),
+    compliance: `${columns.compliance[row]}%`,
+    complianceStatus: names.complianceStatus[columns.complianceStatus[row]] as ComplianceStatus,
+    doctorId: `doctor${columns.doctor[row] + 1}`,
+    hospitalId: `hospital${columns.hospital[row] + 1}`,
+    medications,
+    medicalConditions: conditions,
+    contactNumber: `+91 ${columns.contactNumber[row]}`,
+    bloodGroup: names.bloodGroup[columns.bloodGroup[row]],
+  };
+};
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+MediMinder AI - File change watcher
+
+Uses Linux inotify (through ctypes, no extra dependencies) so changes are
+reported by the kernel instead of found by polling. On other platforms a
+PollingWatcher with the same interface compares mtimes instead.
+
+Usage: python file_watcher.py [DIR ...]
+"""
+
+import ctypes
+import ctypes.util
+import os
+import platform
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Event masks from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+# Writes and atomic replaces (editors usually save via rename)
+CHANGE_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_MOVED_FROM
+EVENT_HEADER = struct.Struct("iIII")
+
+# A change: (path, inotify mask or 0 when polled, wall-clock timestamp)
+Event = Tuple[Path, int, float]
+
+class InotifyWatcher:
+    """Watch directories for file changes with inotify"""
+
+    def __init__(self, mask: int = CHANGE_MASK):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.mask = mask
+        self.watches: Dict[int, Path] = {}
+        self.recursive_roots: Set[Path] = set()
+        self.skip_dirs: Set[str] = set()
+
+    @staticmethod
+    def available() -> bool:
+        if platform.system().lower() != "linux":
+            return False
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6")
+            return hasattr(libc, "inotify_init1")
+        except OSError:
+            return False
+
+    def add(self, directory: Path, recursive: bool = False, skip_dirs: Iterable[str] = ()):
+        """Watch a directory (and, if recursive, every directory below it)"""
+        directory = Path(directory)
+        if recursive:
+            self.recursive_roots.add(directory)
+            self.skip_dirs.update(skip_dirs)
+            for dirpath, dirnames, _ in os.walk(directory):
+                dirnames[:] = [d for d in dirnames if d not in self.skip_dirs and not d.startswith(".")]
+                self.add_one(Path(dirpath))
+        else:
+            self.add_one(directory)
+
+    def add_one(self, directory: Path):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(str(directory)), self.mask | IN_ISDIR)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self.watches[wd] = directory
+
+    def read(self, timeout: Optional[float] = None) -> List[Event]:
+        """Wait up to timeout seconds and return the changes reported so far"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        stamp = time.time()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            directory = self.watches.get(wd)
+            if directory is None or not name:
+                continue
+            path = directory / os.fsdecode(name)
+            # New directories inside a recursive watch are watched too
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and self.is_recursive(path):
+                    self.add(path, recursive=True)
+                continue
+            events.append((path, mask, stamp))
+        return events
+
+    def is_recursive(self, path: Path) -> bool:
+        if path.name in self.skip_dirs or path.name.startswith("."):
+            return False
+        return any(root == path or root in path.parents for root in self.recursive_roots)
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+class PollingWatcher:
+    """Fallback for platforms without inotify: compares mtimes on every read"""
+
+    def __init__(self, interval: float = 0.25):
+        self.interval = interval
+        self.roots: List[Tuple[Path, bool]] = []
+        self.skip_dirs: Set[str] = set()
+        self.snapshot: Dict[Path, int] = {}
+
+    def add(self, directory: Path, recursive: bool = False, skip_dirs: Iterable[str] = ()):
+        self.roots.append((Path(directory), recursive))
+        self.skip_dirs.update(skip_dirs)
+        self.snapshot.update(self.scan_root(Path(directory), recursive))
+
+    def scan_root(self, directory: Path, recursive: bool) -> Dict[Path, int]:
+        result = {}
+        for dirpath, dirnames, filenames in os.walk(directory):
+            dirnames[:] = [d for d in dirnames if recursive and d not in self.skip_dirs and not d.startswith(".")]
+            for name in filenames:
+                path = Path(dirpath) / name
+                try:
+                    result[path] = path.stat().st_mtime_ns
+                except OSError:
+                    continue
+        return result
+
+    def read(self, timeout: Optional[float] = None) -> List[Event]:
+        deadline = time.monotonic() + (timeout if timeout is not None else float("inf"))
+        while True:
+            current: Dict[Path, int] = {}
+            for root, recursive in self.roots:
+                current.update(self.scan_root(root, recursive))
+            stamp = time.time()
+            changed = [(path, 0, stamp) for path in set(current) | set(self.snapshot)
+                       if current.get(path) != self.snapshot.get(path)]
+            self.snapshot = current
+            if changed or time.monotonic() >= deadline:
+                return changed
+            time.sleep(min(self.interval, max(0.0, deadline - time.monotonic())))
+
+    def close(self):
+        pass
+
+def make_watcher():
+    """inotify where available, mtime polling everywhere else"""
+    return InotifyWatcher() if InotifyWatcher.available() else PollingWatcher()
+
+def main():
+    """Print file changes under the given directories until Ctrl+C"""
+    watcher = make_watcher()
+    for directory in sys.argv[1:] or ["."]:
+        watcher.add(Path(directory), recursive=True, skip_dirs={"node_modules", "dist"})
+    print(f"Watching with {type(watcher).__name__} (Ctrl+C to stop)")
+    try:
+        while True:
+            for path, mask, stamp in watcher.read(1.0):
+                print(f"{stamp:.3f} {mask:#010x} {path}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+if __name__ == "__main__":
+    main()
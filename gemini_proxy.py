@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+MediMinder AI - Local caching proxy for Gemini API calls
+
+Sits between the browser (@google/genai pointed at it through
+httpOptions.baseUrl) and generativelanguage.googleapis.com. generateContent
+responses are cached in an LRU with a TTL, keyed by a hash of the model,
+system instruction (which carries the prescription context), the chat
+contents (history plus the new message) and the generation config; the API
+key is never part of the key. Concurrent identical requests share one
+upstream call. The cache survives restarts in a JSON file, and hit-rate and
+latency counters are served at /__proxy/stats.
+
+Usage: python gemini_proxy.py [PORT] [CACHE_FILE]
+"""
+
+import hashlib
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+from percentiles import percentile
+
+UPSTREAM = "https://generativelanguage.googleapis.com"
+# Request fields that determine the answer; everything else (e.g. API key headers) is ignored
+KEY_FIELDS = ("systemInstruction", "contents", "generationConfig", "tools", "toolConfig", "safetySettings")
+# Upstream headers that are passed through to the browser
+FORWARDED_HEADERS = ("content-type",)
+
+class CachedResponse(NamedTuple):
+    status: int
+    headers: List[Tuple[str, str]]
+    body: bytes
+
+class ResponseCache:
+    """Thread-safe LRU of upstream responses with a per-entry TTL
+
+    Changes are written to disk by a background flusher at most every
+    flush_interval seconds (atomic replace), so a burst of misses costs one
+    write.
+    """
+    def __init__(self, path: Optional[Path], max_entries: int = 1000, ttl: float = 24 * 3600,
+                 flush_interval: float = 5.0):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.flush_interval = flush_interval
+        self.entries: "OrderedDict[str, Tuple[float, CachedResponse]]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.dirty = threading.Event()
+        self.stopped = threading.Event()
+        self.flusher = threading.Thread(target=self.flush_loop, daemon=True)
+        self.load()
+
+    def load(self):
+        if self.path is None:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        now = time.time()
+        for key, expires, status, headers, body in stored:
+            if expires > now:
+                self.entries[key] = (expires, CachedResponse(status, [tuple(h) for h in headers], body.encode()))
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self.entries[key]
+                self.dirty.set()
+                return None
+            self.entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, response: CachedResponse):
+        with self.lock:
+            self.entries[key] = (time.time() + self.ttl, response)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        self.dirty.set()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def start(self):
+        self.flusher.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.dirty.set()
+        self.flusher.join(timeout=5)
+
+    def flush_loop(self):
+        while not self.stopped.is_set():
+            self.dirty.wait()
+            self.stopped.wait(self.flush_interval)
+            self.dirty.clear()
+            self.flush()
+
+    def flush(self):
+        if self.path is None:
+            return
+        with self.lock:
+            # Oldest first, so loading restores the LRU order
+            stored = [[key, expires, response.status, response.headers, response.body.decode()]
+                      for key, (expires, response) in self.entries.items()]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_suffix(".tmp")
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(stored, f)
+        os.replace(temporary, self.path)
+
+class Flight:
+    """An upstream call that identical concurrent requests wait on"""
+    def __init__(self):
+        self.done = threading.Event()
+        self.response: Optional[CachedResponse] = None
+
+class ProxyStats:
+    def __init__(self, window: int = 1000):
+        self.lock = threading.Lock()
+        self.counts = {"hits": 0, "misses": 0, "coalesced": 0, "passthrough": 0, "errors": 0}
+        self.latencies: Dict[str, Deque[float]] = {kind: deque(maxlen=window) for kind in ("hit", "upstream")}
+
+    def record(self, count: str, latency_kind: Optional[str] = None, seconds: float = 0.0):
+        with self.lock:
+            self.counts[count] += 1
+            if latency_kind:
+                self.latencies[latency_kind].append(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            counts = dict(self.counts)
+            latencies = {kind: list(values) for kind, values in self.latencies.items()}
+        cacheable = counts["hits"] + counts["misses"] + counts["coalesced"]
+        result: Dict[str, Any] = dict(counts)
+        result["hit_rate"] = round((counts["hits"] + counts["coalesced"]) / cacheable, 3) if cacheable else 0.0
+        for kind, values in latencies.items():
+            for name, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+                result[f"{kind}_{name}_ms"] = round(percentile(values, fraction) * 1000, 2)
+        return result
+
+    def format(self) -> str:
+        stats = self.snapshot()
+        return (f"Gemini proxy: {stats['hits']} hits, {stats['coalesced']} coalesced, {stats['misses']} misses "
+                f"(hit rate {stats['hit_rate']:.0%}), {stats['errors']} errors; upstream p50 "
+                f"{stats['upstream_p50_ms']:.0f} ms vs cached p50 {stats['hit_p50_ms']:.2f} ms")
+
+def cache_key(path: str, body: bytes) -> Optional[str]:
+    """Hash of the answer-determining parts of a generateContent request, or None if not cacheable"""
+    if not path.endswith(":generateContent"):
+        return None
+    try:
+        request = json.loads(body)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    model = path.rsplit("/", 1)[-1].split(":", 1)[0]
+    canonical = json.dumps([model] + [request.get(field) for field in KEY_FIELDS],
+                           sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+class GeminiProxy:
+    """Caching, coalescing forwarder to the Gemini REST API"""
+    def __init__(self, cache: ResponseCache, upstream: str = UPSTREAM, timeout: float = 60.0):
+        self.cache = cache
+        self.upstream = urllib.parse.urlsplit(upstream)
+        self.timeout = timeout
+        self.stats = ProxyStats()
+        self.flights: Dict[str, Flight] = {}
+        self.flights_lock = threading.Lock()
+        self.local = threading.local()
+
+    def connection(self) -> http.client.HTTPConnection:
+        """One keep-alive upstream connection per server thread"""
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            cls = http.client.HTTPSConnection if self.upstream.scheme == "https" else http.client.HTTPConnection
+            connection = cls(self.upstream.netloc, timeout=self.timeout)
+            self.local.connection = connection
+        return connection
+
+    def forward(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> CachedResponse:
+        for attempt in range(2):
+            connection = self.connection()
+            try:
+                connection.request(method, path, body=body or None, headers=headers)
+                response = connection.getresponse()
+                data = response.read()
+            except (OSError, http.client.HTTPException) as e:
+                connection.close()
+                self.local.connection = None
+                # A reused keep-alive connection may have been closed upstream
+                if attempt == 0:
+                    continue
+                message = json.dumps({"error": {"code": 502, "message": f"Gemini proxy: {e}"}}).encode()
+                return CachedResponse(502, [("content-type", "application/json")], message)
+            kept = [(name, value) for name, value in response.getheaders() if name.lower() in FORWARDED_HEADERS]
+            return CachedResponse(response.status, kept, data)
+        raise AssertionError("unreachable")
+
+    def handle(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> Tuple[CachedResponse, str]:
+        """Answer a request and say how: hit, coalesced, miss or passthrough"""
+        start = time.perf_counter()
+        key = cache_key(path, body) if method == "POST" else None
+        if key is None:
+            response = self.forward(method, path, headers, body)
+            self.stats.record("passthrough" if response.status < 500 else "errors")
+            return response, "passthrough"
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.stats.record("hits", "hit", time.perf_counter() - start)
+            return cached, "hit"
+
+        with self.flights_lock:
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.flights[key] = Flight()
+        if not leader:
+            flight.done.wait()
+            self.stats.record("coalesced")
+            return flight.response, "coalesced"
+
+        try:
+            response = self.forward(method, path, headers, body)
+            flight.response = response
+        finally:
+            with self.flights_lock:
+                del self.flights[key]
+            flight.done.set()
+        if response.status == 200:
+            self.cache.put(key, response)
+            self.stats.record("misses", "upstream", time.perf_counter() - start)
+        else:
+            self.stats.record("errors", "upstream", time.perf_counter() - start)
+        return response, "miss"
+
+class ProxyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "MediMinderGeminiProxy"
+    disable_nagle_algorithm = True
+    proxy: GeminiProxy
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_cors_headers(self):
+        # The app calls the proxy cross-origin from the Vite dev server
+        self.send_header("Access-Control-Allow-Origin", self.headers.get("Origin") or "*")
+        self.send_header("Access-Control-Expose-Headers", "X-Cache")
+        self.send_header("Vary", "Origin")
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.send_cors_headers()
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers",
+                         self.headers.get("Access-Control-Request-Headers") or "content-type, x-goog-api-key")
+        self.send_header("Access-Control-Max-Age", "86400")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        if self.path == "/__proxy/stats":
+            self.reply(CachedResponse(200, [("content-type", "application/json")],
+                                      json.dumps(self.proxy.stats.snapshot()).encode()), "stats")
+            return
+        self.proxy_request("GET")
+
+    def do_POST(self):
+        self.proxy_request("POST")
+
+    def proxy_request(self, method: str):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        headers = {name: value for name, value in self.headers.items()
+                   if name.lower() in ("content-type", "x-goog-api-key", "x-goog-api-client", "authorization")}
+        response, outcome = self.proxy.handle(method, self.path, headers, body)
+        self.reply(response, outcome)
+
+    def reply(self, response: CachedResponse, outcome: str):
+        self.send_response(response.status)
+        for name, value in response.headers:
+            self.send_header(name, value)
+        self.send_cors_headers()
+        self.send_header("X-Cache", outcome)
+        self.send_header("Content-Length", str(len(response.body)))
+        self.end_headers()
+        self.wfile.write(response.body)
+
+def make_server(port: int, cache_path: Optional[Path], host: str = "localhost", upstream: str = UPSTREAM,
+                max_entries: int = 1000, ttl: float = 24 * 3600) -> Tuple[ThreadingHTTPServer, GeminiProxy]:
+    """A proxy server bound to host:port (not yet serving) and its GeminiProxy"""
+    cache = ResponseCache(cache_path, max_entries, ttl)
+    cache.start()
+    proxy = GeminiProxy(cache, upstream)
+    handler = type("Handler", (ProxyHandler,), {"proxy": proxy})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server, proxy
+
+def main():
+    """Run the proxy in the foreground"""
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8787
+    cache_path = Path(sys.argv[2]) if len(sys.argv) > 2 else Path(".devsetup") / "gemini-cache.json"
+    server, proxy = make_server(port, cache_path, upstream=os.environ.get("GEMINI_UPSTREAM", UPSTREAM))
+    print(f"Gemini proxy on http://localhost:{port} ({len(proxy.cache)} cached responses; Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        proxy.cache.stop()
+        print(proxy.stats.format())
+
+if __name__ == "__main__":
+    main()
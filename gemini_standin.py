@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+MediMinder AI - Offline Gemini stand-in
+
+Answers the Gemini REST calls made by `chats.sendMessage` (generateContent)
+and its streaming variant (streamGenerateContent?alt=sse) with replies
+templated from a seeded corpus, after delays drawn from a latency profile.
+Profiles also inject errors and stalls, so the chat UI can be benchmarked
+under realistic and pathological model behaviour without network access or
+an API key. The same request with the same seed always gets the same reply
+and timings.
+
+Usage: python gemini_standin.py [PORT] [PROFILE] [SEED]
+"""
+
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+class LatencyProfile(NamedTuple):
+    """Timing and failure behaviour of the stand-in model
+
+    Delays are log-normal: a median and a sigma (0 = constant).
+    """
+    first_token_ms: float
+    first_token_sigma: float
+    chunk_interval_ms: float
+    chunk_interval_sigma: float
+    chunk_chars: int
+    error_rate: float = 0.0
+    stall_rate: float = 0.0
+    stall_ms: float = 0.0
+
+PROFILES: Dict[str, LatencyProfile] = {
+    "instant": LatencyProfile(0, 0, 0, 0, 400),
+    "fast": LatencyProfile(150, 0.3, 15, 0.3, 40),
+    "realistic": LatencyProfile(700, 0.5, 45, 0.6, 24, error_rate=0.01),
+    "slow": LatencyProfile(3000, 0.7, 120, 0.8, 16, error_rate=0.03, stall_rate=0.05, stall_ms=8000),
+    "pathological": LatencyProfile(6000, 1.2, 300, 1.2, 8, error_rate=0.2, stall_rate=0.15, stall_ms=30000),
+}
+
+# Status, Google API status string and message of injected failures
+ERRORS = [
+    (429, "RESOURCE_EXHAUSTED", "Resource has been exhausted (e.g. check quota)."),
+    (500, "INTERNAL", "An internal error has occurred."),
+    (503, "UNAVAILABLE", "The model is overloaded. Please try again later."),
+]
+
+# Intent -> (keywords, reply templates); {medication}, {dosage} and {times}
+# come from the prescription in the system instruction
+CORPUS: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "timing": (("when", "time", "kab", "schedule", "morning", "night"), (
+        "According to your prescription, take {medication} ({dosage}) at {times}. "
+        "Try to take it at the same times every day.",
+        "{medication} is scheduled for {times}. Setting a reminder for each dose can help you stay on track.",
+    )),
+    "side_effects": (("side effect", "nausea", "dizzy", "headache", "reaction", "pain"), (
+        "Some people notice mild side effects with {medication}, such as nausea or dizziness. "
+        "If they are severe or do not go away, please consult your doctor.",
+        "Mild side effects can happen while your body adjusts to {medication}. "
+        "Contact your doctor right away if you have trouble breathing, swelling or a rash.",
+    )),
+    "missed": (("missed", "forgot", "skip", "bhool"), (
+        "If you missed a dose of {medication}, take it as soon as you remember unless it is almost "
+        "time for the next one. Do not take two doses at once.",
+        "Missing one dose of {medication} is usually not dangerous. Continue with your next dose at {times} "
+        "and ask your doctor if you miss doses often.",
+    )),
+    "food": (("food", "eat", "meal", "khana", "empty stomach", "alcohol"), (
+        "{medication} can usually be taken with or without food, but taking it after a meal may reduce "
+        "stomach upset. Please avoid alcohol unless your doctor says it is safe.",
+    )),
+    "dosage": (("dose", "dosage", "increase", "double", "stop"), (
+        "Please do not change your dose of {medication} ({dosage}) on your own. "
+        "Your doctor can advise whether an adjustment is needed.",
+    )),
+    "general": ((), (
+        "I'm MediMinder AI. You are currently taking {medication} ({dosage}) at {times}. "
+        "How can I help you with your medication today?",
+        "Thanks for your question! For anything about {medication} that worries you, your doctor or "
+        "pharmacist is the best person to ask.",
+        "Staying consistent with {medication} is the most important thing. Is there anything specific "
+        "you would like to know about your schedule?",
+    )),
+}
+
+# "- Name (dosage): 08:00, 20:00" lines from geminiService.ts' prescription context
+MEDICATION_LINE = re.compile(r"^- (?P<name>[^(\n]+?) \((?P<dosage>[^)]*)\): (?P<times>.*)$", re.MULTILINE)
+
+def request_text(request: Dict[str, Any]) -> Tuple[str, str]:
+    """(system instruction, last user message) of a generateContent request"""
+    def text_of(content: Optional[Dict[str, Any]]) -> str:
+        return " ".join(part.get("text", "") for part in (content or {}).get("parts", []))
+    contents = request.get("contents") or []
+    user_turns = [content for content in contents if content.get("role", "user") == "user"]
+    return text_of(request.get("systemInstruction")), text_of(user_turns[-1] if user_turns else None)
+
+def compose_reply(system: str, message: str, rng: random.Random) -> str:
+    """Pick an intent by keyword and fill a template from the prescription"""
+    medications = [match.groupdict() for match in MEDICATION_LINE.finditer(system)]
+    medication = rng.choice(medications) if medications else {"name": "your medication",
+                                                              "dosage": "as prescribed", "times": "the prescribed times"}
+    lowered = message.lower()
+    intent = next((name for name, (keywords, _) in CORPUS.items()
+                   if any(keyword in lowered for keyword in keywords)), "general")
+    template = rng.choice(CORPUS[intent][1])
+    return template.format(medication=medication["name"].strip(), dosage=medication["dosage"],
+                           times=medication["times"].strip() or "the prescribed times")
+
+def delay(rng: random.Random, median_ms: float, sigma: float) -> float:
+    """Seconds from a log-normal distribution with the given median"""
+    if median_ms <= 0:
+        return 0.0
+    return median_ms / 1000 * (rng.lognormvariate(0, sigma) if sigma else 1.0)
+
+def chunks(text: str, size: int) -> List[str]:
+    """Split text into ~size character chunks on word boundaries"""
+    pieces: List[str] = []
+    current = ""
+    for word in re.findall(r"\S+\s*", text):
+        if current and len(current) + len(word) > size:
+            pieces.append(current)
+            current = ""
+        current += word
+    return pieces + [current] if current else pieces
+
+def candidate_payload(text: str, model: str, finished: bool) -> Dict[str, Any]:
+    candidate: Dict[str, Any] = {"content": {"parts": [{"text": text}], "role": "model"}, "index": 0}
+    if finished:
+        candidate["finishReason"] = "STOP"
+    return {"candidates": [candidate], "modelVersion": model,
+            "usageMetadata": {"candidatesTokenCount": max(1, len(text) // 4)}}
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "MediMinderGeminiStandin"
+    disable_nagle_algorithm = True
+    profile: LatencyProfile = PROFILES["realistic"]
+    seed = 0
+    counts: Dict[str, int] = {}
+    counts_lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def count(self, outcome: str):
+        with self.counts_lock:
+            self.counts[outcome] = self.counts.get(outcome, 0) + 1
+
+    def send_cors_headers(self):
+        self.send_header("Access-Control-Allow-Origin", self.headers.get("Origin") or "*")
+        self.send_header("Vary", "Origin")
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.send_cors_headers()
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers",
+                         self.headers.get("Access-Control-Request-Headers") or "content-type, x-goog-api-key")
+        self.send_header("Access-Control-Max-Age", "86400")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        if self.path == "/__standin/stats":
+            with self.counts_lock:
+                self.send_json(200, dict(self.counts))
+            return
+        self.send_json(404, {"error": {"code": 404, "message": "Not found", "status": "NOT_FOUND"}})
+
+    def send_json(self, status: int, payload: Dict[str, Any]):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_cors_headers()
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        path = self.path.split("?", 1)[0]
+        match = re.search(r"/models/([^/:]+):(generateContent|streamGenerateContent)$", path)
+        if not match:
+            self.send_json(404, {"error": {"code": 404, "message": "Not found", "status": "NOT_FOUND"}})
+            return
+        try:
+            request = json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            self.send_json(400, {"error": {"code": 400, "message": "Invalid JSON payload", "status": "INVALID_ARGUMENT"}})
+            return
+        model, method = match.groups()
+        # Same request + same seed -> same reply, timings and failures
+        digest = hashlib.sha256(f"{self.seed}:".encode() + json.dumps(request, sort_keys=True).encode()).digest()
+        rng = random.Random(int.from_bytes(digest[:8], "big"))
+        profile = self.profile
+
+        wait = delay(rng, profile.first_token_ms, profile.first_token_sigma)
+        if rng.random() < profile.stall_rate:
+            wait += profile.stall_ms / 1000
+        if rng.random() < profile.error_rate:
+            status, name, message = rng.choice(ERRORS)
+            time.sleep(wait)
+            self.count(f"error_{status}")
+            self.send_json(status, {"error": {"code": status, "message": message, "status": name}})
+            return
+
+        reply = compose_reply(*request_text(request), rng)
+        pieces = chunks(reply, profile.chunk_chars)
+        intervals = [delay(rng, profile.chunk_interval_ms, profile.chunk_interval_sigma) for _ in pieces[1:]]
+        time.sleep(wait)
+        if method == "generateContent":
+            time.sleep(sum(intervals))
+            self.count("ok")
+            self.send_json(200, candidate_payload(reply, model, True))
+            return
+
+        # Server-sent events, one candidate chunk per event, as with ?alt=sse
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_cors_headers()
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        for index, piece in enumerate(pieces):
+            if index:
+                time.sleep(intervals[index - 1])
+            event = json.dumps(candidate_payload(piece, model, index == len(pieces) - 1))
+            self.wfile.write(f"data: {event}\r\n\r\n".encode())
+            self.wfile.flush()
+        self.count("ok_stream")
+
+def make_server(port: int, profile: str = "realistic", seed: int = 0,
+                host: str = "localhost") -> ThreadingHTTPServer:
+    """A stand-in server bound to host:port (not yet serving)"""
+    handler = type("Handler", (StandinHandler,), {"profile": PROFILES[profile], "seed": seed, "counts": {}})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+def main():
+    """Run the stand-in in the foreground"""
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8788
+    profile = sys.argv[2] if len(sys.argv) > 2 else "realistic"
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    if profile not in PROFILES:
+        print(f"Unknown profile {profile!r}; choose from {', '.join(PROFILES)}")
+        sys.exit(1)
+    server = make_server(port, profile, seed)
+    print(f"Gemini stand-in ({profile}, seed {seed}) on http://localhost:{port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+MediMinder AI - Save-to-HMR latency tracker
+
+Timestamps every write under the watched source directories (inotify where
+available) and matches it to the "hmr update" / "page reload" line Vite
+prints once the update has been pushed to the browser. Each match is
+appended to a JSON-lines file; report() turns that into a latency histogram
+and a list of the slowest files.
+
+Usage: python hmr_latency.py [RECORDS_FILE]   (prints a report)
+"""
+
+import json
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+import file_watcher
+from percentiles import percentile
+
+ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*m")
+# e.g. "10:23:45 AM [vite] hmr update /components/Foo.tsx, /index.css (x2)"; Vite 6
+# tags the environment: "[vite] (client) hmr update /App.tsx"
+UPDATE_LINE = re.compile(r"\[vite\] (?:\(\w+\) )?(hmr update|page reload) (.+?)(?: \(x\d+\))?$")
+SOURCE_SUFFIXES = {".ts", ".tsx", ".js", ".jsx", ".css", ".json"}
+# Upper bucket bounds in milliseconds
+BUCKETS = (25, 50, 100, 200, 500, 1000, 2000, float("inf"))
+
+class HmrLatencyTracker:
+    """Pair source-file writes with the Vite update lines they cause
+
+    Feed Vite's output to on_line (e.g. as a LogPump listener). A save of a
+    module that is not an HMR boundary itself shows up as an update of its
+    importer, so a line that names none of the pending files is attributed to
+    the oldest pending write. Writes that never produce an update within
+    `timeout` seconds (files Vite does not serve) are discarded.
+    """
+    def __init__(self, project_root: Path, directories: Iterable[str], records_path: Path,
+                 timeout: float = 30.0):
+        self.project_root = project_root
+        self.directories = [project_root / name for name in directories]
+        self.records_path = records_path
+        self.timeout = timeout
+        self.pending: Dict[str, float] = {}
+        self.records: List[Dict[str, Any]] = []
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.watcher = file_watcher.make_watcher()
+        self.thread = threading.Thread(target=self.watch, daemon=True)
+
+    def start(self):
+        for directory in self.directories:
+            if directory.is_dir():
+                self.watcher.add(directory, recursive=True, skip_dirs={"node_modules", "dist"})
+        self.records_path.parent.mkdir(parents=True, exist_ok=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join(timeout=2)
+        self.watcher.close()
+
+    def watch(self):
+        while not self.stopped.is_set():
+            for path, mask, stamp in self.watcher.read(0.5):
+                if mask & (file_watcher.IN_DELETE | file_watcher.IN_MOVED_FROM):
+                    continue
+                if path.suffix not in SOURCE_SUFFIXES or not path.exists():
+                    continue
+                name = path.relative_to(self.project_root).as_posix()
+                with self.lock:
+                    # Measure from the first save the developer is still waiting on
+                    self.pending.setdefault(name, stamp)
+
+    def on_line(self, line: str):
+        match = UPDATE_LINE.search(ANSI_ESCAPE.sub("", line).strip())
+        if not match:
+            return
+        now = time.time()
+        kind = "reload" if match.group(1) == "page reload" else "hmr"
+        modules = [module.strip().lstrip("/") for module in match.group(2).split(",") if module.strip()]
+        with self.lock:
+            for name, stamp in list(self.pending.items()):
+                if now - stamp > self.timeout:
+                    del self.pending[name]
+            saved = [name for name in modules if name in self.pending]
+            if not saved and self.pending:
+                saved = [min(self.pending, key=self.pending.get)]
+            records = [{"file": name, "kind": kind, "modules": modules,
+                        "latency_ms": round((now - self.pending.pop(name)) * 1000, 1), "at": now}
+                       for name in saved]
+            self.records.extend(records)
+        if records:
+            with open(self.records_path, 'a', encoding='utf-8') as f:
+                for record in records:
+                    f.write(json.dumps(record) + "\n")
+
+def read_records(path: Path) -> List[Dict[str, Any]]:
+    records = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue  # torn final line
+    return records
+
+def report(records: List[Dict[str, Any]], slowest: int = 10) -> str:
+    """Latency histogram over all updates plus the files with the slowest median"""
+    if not records:
+        return "No save-to-HMR measurements recorded"
+    latencies = sorted(record["latency_ms"] for record in records)
+    counts = [0] * len(BUCKETS)
+    for latency in latencies:
+        counts[next(index for index, bound in enumerate(BUCKETS) if latency <= bound)] += 1
+    reloads = sum(1 for record in records if record["kind"] == "reload")
+    lines = [f"Save-to-HMR latency: {len(records)} updates ({reloads} full reloads), "
+             f"p50 {percentile(latencies, 0.5):.0f} ms, "
+             f"p90 {percentile(latencies, 0.9):.0f} ms"]
+    lower = 0
+    widest = max(counts)
+    for bound, count in zip(BUCKETS, counts):
+        label = f"{lower:g}-{bound:g} ms" if bound != float("inf") else f">{lower:g} ms"
+        lines.append(f"  {label:>14} {count:>5} {'#' * round(40 * count / widest)}")
+        lower = bound
+
+    by_file: Dict[str, List[float]] = {}
+    for record in records:
+        by_file.setdefault(record["file"], []).append(record["latency_ms"])
+    ranked = sorted(by_file.items(), key=lambda item: percentile(item[1], 0.5), reverse=True)
+    lines.append("  Slowest files (median / max / saves, ms):")
+    for name, values in ranked[:slowest]:
+        lines.append(f"    {percentile(values, 0.5):>7.0f} {max(values):>7.0f} {len(values):>5}  {name}")
+    return "\n".join(lines)
+
+def main():
+    """Print the report for the given records file, or the default one"""
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(".devsetup") / "metrics" / "hmr-latency.jsonl"
+    if not path.exists():
+        print(f"{path} does not exist; run setup_dev.py with --hmr-latency first")
+        sys.exit(1)
+    print(report(read_records(path)))
+
+if __name__ == "__main__":
+    main()
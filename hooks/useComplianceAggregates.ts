@@ -0,0 +1,49 @@
+import { useEffect, useState } from 'react';
+import {
+  isAggregatesEnabled,
+  loadAggregateSummary,
+  loadHospitalAggregates,
+  type AggregateSummary,
+  type HospitalAggregates,
+} from '../database/aggregates';
+
+interface AggregatesState<T> {
+  aggregates: T;
+  loading: boolean;
+  error: string | null;
+}
+
+// The precomputed aggregates when `setup_dev.py seed --aggregates` output is
+// served, otherwise the fallback rollup as given
+const useAggregates = <T>(load: () => Promise<T>, fallback: T, key: string): AggregatesState<T> => {
+  const enabled = isAggregatesEnabled();
+  const [state, setState] = useState<AggregatesState<T>>({ aggregates: fallback, loading: enabled, error: null });
+
+  useEffect(() => {
+    if (!enabled) {
+      setState({ aggregates: fallback, loading: false, error: null });
+      return;
+    }
+    let cancelled = false;
+    setState(previous => ({ ...previous, loading: true }));
+    load()
+      .then(aggregates => {
+        if (!cancelled) setState({ aggregates, loading: false, error: null });
+      })
+      .catch((error: Error) => {
+        if (!cancelled) setState({ aggregates: fallback, loading: false, error: error.message });
+      });
+    return () => { cancelled = true; };
+    // load is a fresh closure each render; key identifies what it fetches
+  }, [enabled, fallback, key]);
+
+  return state;
+};
+
+// Totals, specialties and locations (aggregates/summary.json)
+export const useAggregateSummary = (fallback: AggregateSummary) =>
+  useAggregates(loadAggregateSummary, fallback, 'summary');
+
+// One hospital and its doctors (that hospital's file only)
+export const useHospitalAggregates = (hospitalId: string, fallback: HospitalAggregates) =>
+  useAggregates(() => loadHospitalAggregates(hospitalId), fallback, hospitalId);
@@ -0,0 +1,38 @@
+import { useEffect, useState } from 'react';
+import type { Hospital } from '../types';
+import { isShardedDatasetEnabled, loadHospitalList, loadManifest } from '../database/shardLoader';
+
+interface HospitalListState {
+  hospitals: Hospital[];
+  totalPatients: number;
+  loading: boolean;
+  error: string | null;
+}
+
+// Every hospital (with doctor and patient counts) and the patient count from
+// the manifest when a sharded dataset is served, otherwise the in-memory
+// hospitals as given
+export const useHospitalList = (fallback: Hospital[], fallbackPatients: number): HospitalListState => {
+  const enabled = isShardedDatasetEnabled();
+  const [state, setState] = useState<HospitalListState>({
+    hospitals: fallback, totalPatients: fallbackPatients, loading: enabled, error: null,
+  });
+
+  useEffect(() => {
+    if (!enabled) {
+      setState({ hospitals: fallback, totalPatients: fallbackPatients, loading: false, error: null });
+      return;
+    }
+    let cancelled = false;
+    Promise.all([loadHospitalList(), loadManifest()])
+      .then(([hospitals, manifest]) => {
+        if (!cancelled) setState({ hospitals, totalPatients: manifest.totalPatients, loading: false, error: null });
+      })
+      .catch((error: Error) => {
+        if (!cancelled) setState({ hospitals: fallback, totalPatients: fallbackPatients, loading: false, error: error.message });
+      });
+    return () => { cancelled = true; };
+  }, [enabled, fallback, fallbackPatients]);
+
+  return state;
+};
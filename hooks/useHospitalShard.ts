@@ -0,0 +1,35 @@
+import { useEffect, useState } from 'react';
+import type { Hospital } from '../types';
+import { isShardedDatasetEnabled, loadHospitalShard } from '../database/shardLoader';
+
+interface HospitalShardState {
+  hospital: Hospital;
+  loading: boolean;
+  error: string | null;
+}
+
+// The hospital's doctors and patients from its dataset shard when a sharded
+// dataset is served, otherwise the in-memory hospital as given
+export const useHospitalShard = (fallback: Hospital): HospitalShardState => {
+  const enabled = isShardedDatasetEnabled();
+  const [state, setState] = useState<HospitalShardState>({ hospital: fallback, loading: enabled, error: null });
+
+  useEffect(() => {
+    if (!enabled) {
+      setState({ hospital: fallback, loading: false, error: null });
+      return;
+    }
+    let cancelled = false;
+    setState({ hospital: fallback, loading: true, error: null });
+    loadHospitalShard(fallback.id)
+      .then(shard => {
+        if (!cancelled) setState({ hospital: shard.hospital, loading: false, error: null });
+      })
+      .catch((error: Error) => {
+        if (!cancelled) setState({ hospital: fallback, loading: false, error: error.message });
+      });
+    return () => { cancelled = true; };
+  }, [enabled, fallback]);
+
+  return state;
+};
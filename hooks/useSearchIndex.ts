@@ -0,0 +1,31 @@
+import { useEffect, useState } from 'react';
+import { isShardedDatasetEnabled, loadManifest } from '../database/shardLoader';
+import { isSearchIndexEnabled, loadServedSearchIndex, type SearchIndex } from '../database/searchIndex';
+
+// The served search index once it has loaded, if it describes the served
+// sharded dataset (same seed and record counts). Otherwise null and callers
+// scan: the in-memory records are generated separately and never indexed.
+export const useSearchIndex = (): SearchIndex | null => {
+  const enabled = isShardedDatasetEnabled() && isSearchIndexEnabled();
+  const [index, setIndex] = useState<SearchIndex | null>(null);
+
+  useEffect(() => {
+    if (!enabled) {
+      setIndex(null);
+      return;
+    }
+    let cancelled = false;
+    Promise.all([loadServedSearchIndex(), loadManifest()])
+      .then(([loaded, manifest]) => {
+        const matches = loaded.seed === manifest.seed
+          && loaded.tables.patients.rows === manifest.totalPatients
+          && loaded.tables.doctors.rows === manifest.totalDoctors;
+        if (!matches) console.warn('Search index was built for another dataset; searching by scan');
+        if (!cancelled) setIndex(matches ? loaded : null);
+      })
+      .catch((error: Error) => console.warn(`Search index unavailable, searching by scan: ${error.message}`));
+    return () => { cancelled = true; };
+  }, [enabled]);
+
+  return index;
+};
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+MediMinder AI - Shared percentile helper
+
+One nearest-rank percentile for every latency and resource report
+(resource_sampler, preview_server, hmr_latency, gemini_proxy), so p50/p90/p99
+mean the same thing everywhere.
+"""
+
+import math
+from typing import Iterable
+
+def percentile(values: Iterable[float], fraction: float) -> float:
+    """Nearest-rank percentile of unsorted values: the ceil(fraction * n)-th smallest value"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+MediMinder AI - Port to process resolver
+
+Maps TCP ports to the processes that own them by reading /proc/net/tcp,
+/proc/net/tcp6 and /proc/<pid>/fd directly, without spawning lsof or netstat.
+Linux only; callers should check available() and fall back otherwise.
+
+Usage: python port_resolver.py PORT [PORT ...]
+"""
+
+import os
+import platform
+import signal
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+PROC = Path("/proc")
+TCP_TABLES = ("net/tcp", "net/tcp6")
+
+# Socket states from include/net/tcp_states.h
+TCP_LISTEN = "0A"
+TCP_TIME_WAIT = "06"
+
+class PortOwner(NamedTuple):
+    """A process holding a socket bound to a port"""
+    pid: int
+    port: int
+    cmdline: str
+
+def available() -> bool:
+    """True if the /proc interfaces this module relies on exist"""
+    return (PROC / "net" / "tcp").exists()
+
+def read_sockets() -> List[tuple]:
+    """Parse the kernel TCP tables into (port, state, inode) tuples"""
+    sockets = []
+    for table in TCP_TABLES:
+        try:
+            with open(PROC / table, 'r', encoding='ascii') as f:
+                next(f, None)  # header
+                for line in f:
+                    fields = line.split()
+                    if len(fields) < 10:
+                        continue
+                    port = int(fields[1].rsplit(":", 1)[1], 16)
+                    sockets.append((port, fields[3], int(fields[9])))
+        except FileNotFoundError:
+            continue
+    return sockets
+
+def busy_ports(sockets: Optional[List[tuple]] = None) -> Set[int]:
+    """Ports that a new listener could not bind to right now"""
+    sockets = read_sockets() if sockets is None else sockets
+    return {port for port, state, _ in sockets if state != TCP_TIME_WAIT}
+
+def socket_owners(inodes: Set[int]) -> Dict[int, Set[int]]:
+    """Map socket inodes to the PIDs holding them in one pass over /proc/*/fd"""
+    owners: Dict[int, Set[int]] = {}
+    if not inodes:
+        return owners
+    for entry in os.scandir(PROC):
+        if not entry.name.isdigit():
+            continue
+        pid = int(entry.name)
+        try:
+            fds = os.scandir(f"{entry.path}/fd")
+        except (PermissionError, FileNotFoundError):
+            continue
+        with fds:
+            for fd in fds:
+                try:
+                    target = os.readlink(fd.path)
+                except OSError:
+                    continue
+                if target.startswith("socket:["):
+                    inode = int(target[8:-1])
+                    if inode in inodes:
+                        owners.setdefault(inode, set()).add(pid)
+    return owners
+
+def read_cmdline(pid: int) -> str:
+    try:
+        with open(PROC / str(pid) / "cmdline", 'rb') as f:
+            return f.read().replace(b"\0", b" ").decode(errors="replace").strip()
+    except OSError:
+        return ""
+
+def port_owners(ports: Iterable[int], listening_only: bool = True) -> List[PortOwner]:
+    """Every process holding a socket on any of the given ports"""
+    wanted = set(ports)
+    inode_ports = {}
+    for port, state, inode in read_sockets():
+        if port in wanted and inode and (state == TCP_LISTEN or not listening_only):
+            inode_ports[inode] = port
+    result = []
+    seen = set()
+    for inode, pids in socket_owners(set(inode_ports)).items():
+        for pid in sorted(pids):
+            if (pid, inode_ports[inode]) not in seen:
+                seen.add((pid, inode_ports[inode]))
+                result.append(PortOwner(pid, inode_ports[inode], read_cmdline(pid)))
+    return sorted(result)
+
+def pid_alive(pid: int) -> bool:
+    """True if a process with this PID exists (without signalling it)"""
+    if pid <= 0:
+        return False
+    if platform.system().lower() == "windows":
+        import ctypes
+        handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        ctypes.windll.kernel32.CloseHandle(handle)
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def terminate(pids: Iterable[int], timeout: float = 5.0) -> List[int]:
+    """Stop processes gracefully: SIGTERM, wait up to timeout, then SIGKILL
+
+    Returns the PIDs that are still running afterwards (e.g. not ours to kill).
+    """
+    pending = set()
+    for pid in set(pids):
+        try:
+            os.kill(pid, signal.SIGTERM)
+            pending.add(pid)
+        except ProcessLookupError:
+            continue
+        except PermissionError:
+            pending.add(pid)
+
+    deadline = time.monotonic() + timeout
+    while pending and time.monotonic() < deadline:
+        pending = {pid for pid in pending if pid_alive(pid)}
+        if pending:
+            time.sleep(0.05)
+
+    for pid in list(pending):
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            continue
+    time.sleep(0.05)
+    return sorted(pid for pid in pending if pid_alive(pid))
+
+def main():
+    """Print the owners of each port given on the command line"""
+    if not available():
+        print("port_resolver needs Linux /proc")
+        sys.exit(1)
+    ports = [int(arg) for arg in sys.argv[1:]]
+    owners = port_owners(ports)
+    if not owners:
+        print("No listening processes on " + ", ".join(map(str, ports)))
+    for owner in owners:
+        print(f"{owner.port:>5}  {owner.pid:>7}  {owner.cmdline}")
+
+if __name__ == "__main__":
+    main()
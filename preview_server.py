@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+MediMinder AI - Production preview server and load-test client
+
+Serves a production build (dist/) the way a CDN would: precompressed .br/.gz
+siblings chosen by Accept-Encoding, strong ETags computed once at startup,
+immutable caching for content-hashed assets, byte ranges and an SPA fallback
+to index.html. File bodies go out with os.sendfile, so they are never copied
+through Python.
+
+Usage: python preview_server.py [DIST_DIR] [PORT]
+       python preview_server.py --load-test URL [SECONDS] [CONNECTIONS]
+"""
+
+import hashlib
+import http.client
+import mimetypes
+import os
+import re
+import sys
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from build_budget import HASHED_NAME
+from percentiles import percentile
+
+# Preferred first when the client accepts several
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+class Variant(NamedTuple):
+    """One stored representation of an asset"""
+    path: str
+    size: int
+    etag: str
+
+class Asset(NamedTuple):
+    content_type: str
+    cache_control: str
+    variants: Dict[str, Variant]  # content-coding ("identity", "gzip", "br") -> variant
+
+def build_index(dist: Path) -> Dict[str, Asset]:
+    """Map URL paths to assets, hashing every file once up front"""
+    def variant(path: Path) -> Variant:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return Variant(str(path), path.stat().st_size, f'"{digest.hexdigest()[:32]}"')
+
+    index = {}
+    for path in sorted(dist.rglob("*")):
+        if not path.is_file() or path.suffix in (".br", ".gz"):
+            continue
+        variants = {"identity": variant(path)}
+        for coding, suffix in ENCODINGS:
+            sibling = path.with_name(path.name + suffix)
+            if sibling.exists():
+                variants[coding] = variant(sibling)
+        url = "/" + path.relative_to(dist).as_posix()
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type in ("application/javascript", "image/svg+xml"):
+            content_type += "; charset=utf-8"
+        hashed = url.startswith("/assets/") and HASHED_NAME.match(path.name)
+        index[url] = Asset(content_type, IMMUTABLE if hashed else REVALIDATE, variants)
+    return index
+
+def accepted_codings(header: str) -> Dict[str, float]:
+    """Parse Accept-Encoding into coding -> q-value"""
+    codings = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        match = re.search(r"q=([0-9.]+)", params)
+        if match:
+            try:
+                quality = float(match.group(1))
+            except ValueError:
+                continue
+        if name:
+            codings[name.lower()] = quality
+    return codings
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """(start, end inclusive) of a single satisfiable byte range, else None
+
+    Raises ValueError for an unsatisfiable range. Multi-range requests are
+    answered with the whole body, which RFC 9110 allows.
+    """
+    match = RANGE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        start, end = max(0, size - int(last)), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+class PreviewHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "MediMinderPreview"
+    # Headers and the sendfile body are separate writes; Nagle would hold the body back
+    disable_nagle_algorithm = True
+    index: Dict[str, Asset] = {}
+    quiet = True
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def do_HEAD(self):
+        self.do_GET(head=True)
+
+    def do_GET(self, head: bool = False):
+        url = urllib.parse.unquote(urllib.parse.urlsplit(self.path).path)
+        if url.endswith("/"):
+            url += "index.html"
+        asset = self.index.get(url)
+        if asset is None:
+            # SPA fallback: client-side routes get the app, missing files a 404
+            if "." in url.rsplit("/", 1)[-1] or "/index.html" not in self.index:
+                self.send_error(404)
+                return
+            asset = self.index["/index.html"]
+
+        range_header = self.headers.get("Range")
+        if range_header and self.headers.get("If-Range") not in (None, asset.variants["identity"].etag):
+            range_header = None
+        if range_header:
+            coding = "identity"  # ranges address the unencoded bytes
+        else:
+            accepted = accepted_codings(self.headers.get("Accept-Encoding", ""))
+            coding = next((name for name, _ in ENCODINGS
+                           if name in asset.variants and accepted.get(name, accepted.get("*", 0)) > 0),
+                          "identity")
+        variant = asset.variants[coding]
+
+        # Weak comparison, as RFC 9110 requires for If-None-Match
+        if_none_match = {tag.strip().removeprefix("W/") for tag in self.headers.get("If-None-Match", "").split(",")}
+        if variant.etag in if_none_match or "*" in if_none_match:
+            self.send_response(304)
+            self.send_common_headers(asset, variant, coding)
+            self.end_headers()
+            return
+
+        start, end = 0, variant.size - 1
+        status = 200
+        if range_header:
+            try:
+                byte_range = parse_range(range_header, variant.size)
+            except ValueError:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{variant.size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            if byte_range:
+                start, end = byte_range
+                status = 206
+
+        self.send_response(status)
+        self.send_common_headers(asset, variant, coding)
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{variant.size}")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        if not head and end >= start:
+            self.send_body(variant.path, start, end - start + 1)
+
+    def send_common_headers(self, asset: Asset, variant: Variant, coding: str):
+        self.send_header("Content-Type", asset.content_type)
+        self.send_header("ETag", variant.etag)
+        self.send_header("Cache-Control", asset.cache_control)
+        self.send_header("Accept-Ranges", "bytes")
+        if len(asset.variants) > 1:
+            self.send_header("Vary", "Accept-Encoding")
+        if coding != "identity":
+            self.send_header("Content-Encoding", coding)
+
+    def send_body(self, path: str, offset: int, count: int):
+        with open(path, 'rb') as f:
+            if not hasattr(os, "sendfile"):
+                self.connection.sendfile(f, offset, count)
+                return
+            out = self.connection.fileno()
+            while count > 0:
+                sent = os.sendfile(out, f.fileno(), offset, count)
+                if sent == 0:
+                    break
+                offset += sent
+                count -= sent
+
+def make_server(dist: Path, port: int, host: str = "localhost", quiet: bool = True) -> ThreadingHTTPServer:
+    """A preview server for dist bound to host:port (not yet serving)"""
+    handler = type("Handler", (PreviewHandler,), {"index": build_index(dist), "quiet": quiet})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+def load_test(base_url: str, paths: List[str], duration: float = 10.0, connections: int = 16,
+              accept_encoding: str = "br, gzip") -> Dict[str, float]:
+    """Hammer base_url with keep-alive connections cycling through paths
+
+    Returns requests/s, throughput and latency percentiles in milliseconds.
+    """
+    parsed = urllib.parse.urlsplit(base_url)
+    latencies: List[List[float]] = [[] for _ in range(connections)]
+    errors = [0] * connections
+    received = [0] * connections
+    deadline = time.perf_counter() + duration
+
+    def worker(slot: int):
+        connection = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=10)
+        index = slot
+        while time.perf_counter() < deadline:
+            path = paths[index % len(paths)]
+            index += 1
+            start = time.perf_counter()
+            try:
+                connection.request("GET", path, headers={"Accept-Encoding": accept_encoding})
+                response = connection.getresponse()
+                body = response.read()
+            except (OSError, http.client.HTTPException):
+                errors[slot] += 1
+                connection.close()
+                connection = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=10)
+                continue
+            latencies[slot].append(time.perf_counter() - start)
+            received[slot] += len(body)
+            if response.status >= 400:
+                errors[slot] += 1
+        connection.close()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(slot,), daemon=True) for slot in range(connections)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    ordered = sorted(latency for per_slot in latencies for latency in per_slot)
+    return {
+        "requests": len(ordered),
+        "errors": sum(errors),
+        "requests_per_second": len(ordered) / elapsed,
+        "mib_per_second": sum(received) / elapsed / (1 << 20),
+        "p50_ms": percentile(ordered, 0.5) * 1000,
+        "p90_ms": percentile(ordered, 0.9) * 1000,
+        "p99_ms": percentile(ordered, 0.99) * 1000,
+        "max_ms": (ordered[-1] if ordered else 0.0) * 1000,
+    }
+
+def format_load_test(result: Dict[str, float]) -> str:
+    return (f"{result['requests']:.0f} requests, {result['errors']:.0f} errors, "
+            f"{result['requests_per_second']:.0f} req/s, {result['mib_per_second']:.1f} MiB/s\n"
+            f"latency p50 {result['p50_ms']:.2f} ms, p90 {result['p90_ms']:.2f} ms, "
+            f"p99 {result['p99_ms']:.2f} ms, max {result['max_ms']:.2f} ms")
+
+def main():
+    """Serve dist/, or load-test a running server with --load-test"""
+    if len(sys.argv) > 1 and sys.argv[1] == "--load-test":
+        url = sys.argv[2] if len(sys.argv) > 2 else "http://localhost:4173/"
+        duration = float(sys.argv[3]) if len(sys.argv) > 3 else 10.0
+        connections = int(sys.argv[4]) if len(sys.argv) > 4 else 16
+        path = urllib.parse.urlsplit(url).path or "/"
+        print(format_load_test(load_test(url, [path], duration, connections)))
+        return
+    dist = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("dist")
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 4173
+    server = make_server(dist, port)
+    print(f"Serving {dist} on http://localhost:{port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
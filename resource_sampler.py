@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+MediMinder AI - Dev server resource sampler
+
+Samples RSS, CPU and I/O of a process tree (the Vite/node processes started
+by setup_dev.py) from /proc/<pid>/{stat,status,io} at a fixed interval and
+appends them to a compact binary time-series file. A least-squares slope
+over a sliding window flags sustained RSS growth. Linux only; callers should
+check available() first.
+
+Usage: python resource_sampler.py [RUN_FILE]   (prints a summary)
+"""
+
+import os
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from percentiles import percentile
+
+PROC = Path("/proc")
+MAGIC = b"MMRS\x00\x01\x00\x00"
+# timestamp, process count, rss (KiB), cpu (% of one core), cumulative read/write bytes
+RECORD = struct.Struct("<dIIfQQ")
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+class Sample(NamedTuple):
+    timestamp: float
+    processes: int
+    rss_kb: int
+    cpu_percent: float
+    read_bytes: int
+    write_bytes: int
+
+def available() -> bool:
+    """True if per-process /proc statistics can be read"""
+    return (PROC / "self" / "stat").exists()
+
+def read_stat(pid: int) -> Optional[Tuple[int, int]]:
+    """(ppid, utime + stime ticks) from /proc/<pid>/stat"""
+    try:
+        with open(PROC / str(pid) / "stat", 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    # The command name may contain spaces or parentheses; fields follow the last ')'
+    fields = data[data.rfind(b")") + 2:].split()
+    return int(fields[1]), int(fields[11]) + int(fields[12])
+
+def read_rss_kb(pid: int) -> int:
+    try:
+        with open(PROC / str(pid) / "status", 'rb') as f:
+            for line in f:
+                if line.startswith(b"VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+def read_io(pid: int) -> Tuple[int, int]:
+    """(read_bytes, write_bytes) from /proc/<pid>/io, zeros if not permitted"""
+    values = {}
+    try:
+        with open(PROC / str(pid) / "io", 'rb') as f:
+            for line in f:
+                key, _, value = line.partition(b":")
+                values[key] = int(value)
+    except (OSError, ValueError):
+        pass
+    return values.get(b"read_bytes", 0), values.get(b"write_bytes", 0)
+
+def process_tree(root: int, include_root: bool = True) -> Set[int]:
+    """root and all of its descendants, from one scan of /proc/*/stat"""
+    children: Dict[int, List[int]] = {}
+    for entry in os.scandir(PROC):
+        if entry.name.isdigit():
+            stat = read_stat(int(entry.name))
+            if stat:
+                children.setdefault(stat[0], []).append(int(entry.name))
+    tree = set()
+    stack = [root]
+    while stack:
+        pid = stack.pop()
+        tree.add(pid)
+        stack.extend(children.get(pid, []))
+    if not include_root:
+        tree.discard(root)
+    return tree
+
+def slope_per_minute(samples: List[Sample]) -> Tuple[float, float]:
+    """Least-squares RSS slope in MiB/minute and its R^2 over the samples"""
+    if len(samples) < 3:
+        return 0.0, 0.0
+    xs = [sample.timestamp for sample in samples]
+    ys = [sample.rss_kb / 1024 for sample in samples]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    syy = sum((y - mean_y) ** 2 for y in ys)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    if sxx == 0:
+        return 0.0, 0.0
+    slope = sxy / sxx
+    r_squared = (sxy * sxy) / (sxx * syy) if syy else 0.0
+    return slope * 60, r_squared
+
+class ResourceSampler:
+    """Background thread that samples a process tree into a time-series file
+
+    on_growth is called (at most once per window) when RSS grows faster than
+    growth_mb_per_min with a good linear fit, i.e. steadily rather than in a
+    single spike.
+    """
+    def __init__(self, root_pid: int, path: Path, interval: float = 1.0, include_root: bool = True,
+                 window: int = 120, growth_mb_per_min: float = 5.0, min_r_squared: float = 0.8,
+                 on_growth: Optional[Callable[[float], None]] = None):
+        self.root_pid = root_pid
+        self.path = path
+        self.interval = interval
+        self.include_root = include_root
+        self.window = window
+        self.growth_mb_per_min = growth_mb_per_min
+        self.min_r_squared = min_r_squared
+        self.on_growth = on_growth
+        self.recent: List[Sample] = []
+        self.previous: Dict[int, Tuple[int, int, int]] = {}
+        self.totals = [0, 0]
+        self.last_time: Optional[float] = None
+        self.last_alert = 0.0
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join(timeout=self.interval * 2 + 1)
+
+    def sample(self) -> Sample:
+        now = time.time()
+        cpu_ticks = 0
+        rss = 0
+        pids = process_tree(self.root_pid, self.include_root)
+        current = {}
+        for pid in pids:
+            stat = read_stat(pid)
+            if stat is None:
+                continue
+            read_bytes, write_bytes = read_io(pid)
+            current[pid] = (stat[1], read_bytes, write_bytes)
+            rss += read_rss_kb(pid)
+            # Deltas per PID, so processes that exit or get replaced never go negative
+            ticks, reads, writes = self.previous.get(pid, (stat[1], read_bytes, write_bytes))
+            cpu_ticks += max(0, stat[1] - ticks)
+            self.totals[0] += max(0, read_bytes - reads)
+            self.totals[1] += max(0, write_bytes - writes)
+        self.previous = current
+        elapsed = (now - self.last_time) if self.last_time else 0.0
+        self.last_time = now
+        cpu = (cpu_ticks / CLOCK_TICKS) / elapsed * 100 if elapsed else 0.0
+        return Sample(now, len(current), rss, cpu, self.totals[0], self.totals[1])
+
+    def run(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'ab') as f:
+            if f.tell() == 0:
+                f.write(MAGIC)
+            while not self.stopped.is_set():
+                sample = self.sample()
+                f.write(RECORD.pack(*sample))
+                f.flush()
+                self.check_growth(sample)
+                self.stopped.wait(self.interval)
+
+    def check_growth(self, sample: Sample):
+        self.recent.append(sample)
+        if len(self.recent) > self.window:
+            del self.recent[0]
+        if len(self.recent) < self.window or sample.timestamp - self.last_alert < self.window * self.interval:
+            return
+        slope, r_squared = slope_per_minute(self.recent)
+        if slope >= self.growth_mb_per_min and r_squared >= self.min_r_squared:
+            self.last_alert = sample.timestamp
+            if self.on_growth:
+                self.on_growth(slope)
+
+def read_samples(path: Path) -> List[Sample]:
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path} is not a resource sample file")
+    body = data[len(MAGIC):]
+    usable = len(body) - len(body) % RECORD.size  # ignore a torn final record
+    return [Sample(*fields) for fields in RECORD.iter_unpack(body[:usable])]
+
+def summarize(path: Path) -> str:
+    """Human-readable percentiles and RSS trend for one run"""
+    samples = read_samples(path)
+    if len(samples) < 2:
+        return f"{path.name}: not enough samples"
+    duration = samples[-1].timestamp - samples[0].timestamp
+    read_rates = []
+    write_rates = []
+    for before, after in zip(samples, samples[1:]):
+        elapsed = after.timestamp - before.timestamp
+        if elapsed > 0:
+            read_rates.append((after.read_bytes - before.read_bytes) / elapsed / 1024)
+            write_rates.append((after.write_bytes - before.write_bytes) / elapsed / 1024)
+    series = {
+        "RSS (MiB)": [sample.rss_kb / 1024 for sample in samples],
+        "CPU (%)": [sample.cpu_percent for sample in samples[1:]],
+        "read (KiB/s)": read_rates,
+        "write (KiB/s)": write_rates,
+        "processes": [float(sample.processes) for sample in samples],
+    }
+    slope, r_squared = slope_per_minute(samples)
+    lines = [f"{path.name}: {len(samples)} samples over {duration / 60:.1f} min",
+             f"  {'metric':<14} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}"]
+    for name, values in series.items():
+        cells = [percentile(values, fraction) for fraction in (0.5, 0.9, 0.99)] + [max(values, default=0.0)]
+        lines.append(f"  {name:<14} " + " ".join(f"{value:9.1f}" for value in cells))
+    lines.append(f"  RSS trend: {slope:+.2f} MiB/min (R^2 {r_squared:.2f})")
+    return "\n".join(lines)
+
+def latest_run(directory: Path) -> Optional[Path]:
+    runs = sorted(directory.glob("resources-*.bin"))
+    return runs[-1] if runs else None
+
+def main():
+    """Summarize the given run file, or the latest one in .devsetup/metrics"""
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else latest_run(Path(".devsetup") / "metrics")
+    if path is None:
+        print("No resource sample runs found")
+        sys.exit(1)
+    print(summarize(path))
+
+if __name__ == "__main__":
+    main()
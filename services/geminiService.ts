@@ -12,7 +12,13 @@ const getApiKey = (): string => {
   return apiKey;
 };
 
-const ai = new GoogleGenAI({ apiKey: getApiKey() });
+// Set when setup_dev.py runs the local caching proxy (see vite.config.ts)
+const baseUrl = process.env.GEMINI_BASE_URL;
+
+const ai = new GoogleGenAI({
+  apiKey: getApiKey(),
+  ...(baseUrl && { httpOptions: { baseUrl } }),
+});
 
 const systemInstruction = `You are "MediMinder AI", a friendly, multilingual AI healthcare assistant for a medicine reminder app. 
 Your role is to answer patient questions about their medication, side effects, and general well-being in a simple, clear, and supportive manner. 
@@ -1,5 +1,5 @@
 import type { Patient, Doctor, Hospital, ComplianceStatus } from '../types';
-import { PATIENTS, DOCTORS, HOSPITALS } from '../database/mockDatabase';
+import { PATIENTS, DOCTORS, HOSPITALS, getComplianceStatistics } from '../database/mockDatabase';
 
 export interface RiskAssessment {
   patientId: string;
@@ -324,7 +324,7 @@ class PredictiveAnalytics {
     const insights: PopulationInsight[] = [];
     
     // Adherence patterns insight
-    const nonCompliantCount = PATIENTS.filter(p => p.complianceStatus === 'Non-Compliant').length;
+    const nonCompliantCount = getComplianceStatistics().nonCompliant;
     insights.push({
       id: 'adherence-trend-001',
       title: 'Declining Adherence in Diabetes Patients',
@@ -1,6 +1,6 @@
 import { mockEventBus, type RealTimeEvent } from './mockEventBus';
 import { predictiveAnalytics, type RiskAssessment, type PopulationInsight } from './predictiveAnalytics';
-import { PATIENTS, DOCTORS, HOSPITALS } from '../database/mockDatabase';
+import { PATIENTS, DOCTORS, HOSPITALS, getComplianceStatistics } from '../database/mockDatabase';
 
 export interface AppState {
   notifications: NotificationItem[];
@@ -347,8 +347,7 @@ class RealtimeStateManager {
   }
 
   private calculateOverallComplianceRate(): number {
-    const compliantPatients = PATIENTS.filter(p => p.complianceStatus === 'Compliant').length;
-    return Math.round((compliantPatients / PATIENTS.length) * 100);
+    return getComplianceStatistics().complianceRate;
   }
 
   private calculateAverageRiskScore(): number {
@@ -109,4 +109,7 @@ export interface Hospital {
   emergencyNumber?: string;
   doctors: Doctor[];
   patients: Patient[];
+  // Set instead of embedding doctors and patients (the sharded dataset's hospital list)
+  doctorCount?: number;
+  patientCount?: number;
 }
\ No newline at end of file
@@ -18,15 +18,23 @@ export default defineConfig(({ mode }) => {
         host: host,
         open: !isReplit, // Only auto-open browser in local development
         allowedHosts: isReplit ? true : undefined,
-        strictPort: false, // Allow Vite to try next port if current is busy
+        // setup_dev.py leases a port and sets VITE_STRICT_PORT so Vite fails
+        // loudly instead of silently moving to another port
+        strictPort: env.VITE_STRICT_PORT === 'true',
         hmr: {
           port: port,
-          ...(isReplit && { clientPort: 443 })
+          ...(isReplit && { clientPort: 443 }),
+          // Set by `setup_dev.py --supervise`, whose stable port proxies to the active server
+          ...(env.VITE_HMR_CLIENT_PORT && { clientPort: Number(env.VITE_HMR_CLIENT_PORT) })
         },
         // Handle CORS for local development
         cors: true,
         // Clear screen on restart
-        clearScreen: false
+        clearScreen: false,
+        // Generated datasets (setup_dev.py seed) can hold thousands of shard files
+        watch: {
+          ignored: ['**/database/generated/**']
+        }
       },
       plugins: [
         react({
@@ -37,6 +45,8 @@ export default defineConfig(({ mode }) => {
       define: {
         'process.env.API_KEY': JSON.stringify(env.GEMINI_API_KEY || env.API_KEY || ''),
         'process.env.GEMINI_API_KEY': JSON.stringify(env.GEMINI_API_KEY || env.API_KEY || ''),
+        // Set by `setup_dev.py --gemini-proxy` / `--gemini-standin` to route Gemini calls locally
+        'process.env.GEMINI_BASE_URL': JSON.stringify(env.GEMINI_BASE_URL || ''),
         // Define NODE_ENV for proper environment detection
         'process.env.NODE_ENV': JSON.stringify(mode)
       },
@@ -57,8 +67,10 @@ export default defineConfig(({ mode }) => {
           'react-dom',
           '@google/genai'
         ],
-        // Force pre-bundling of these packages
-        force: mode === 'development'
+        // Only force re-bundling on request (VITE_OPTIMIZE_FORCE=true); the
+        // node_modules/.vite cache is cleared by setup_dev.py when
+        // package-lock.json or this config changes
+        force: env.VITE_OPTIMIZE_FORCE === 'true'
       },
       // Build configuration for production
       build: {